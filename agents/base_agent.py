@@ -1,11 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
 from models.schemas import ClassificationResult
 from memory.shared_memory import memory_store
+from utils.keyword_matcher import KeywordMatcher
+import asyncio
+import time
 import uuid
 from datetime import datetime
 
+# Max decisions written per background flush
+LOG_BATCH_SIZE = 64
+
+# (entry_id, agent_name, decision, epoch_seconds, agent_id)
+DecisionRecord = Tuple[str, str, str, float, str]
+
 class BaseAgent(ABC):
+    __slots__ = ("name", "agent_id")
+    
+    # Decision log shared by all agents, drained by one background task per event loop
+    _log_queue: Optional[asyncio.Queue] = None
+    _log_task: Optional[asyncio.Task] = None
+    _log_loop: Optional[asyncio.AbstractEventLoop] = None
+    
     def __init__(self, name: str):
         self.name = name
         self.agent_id = str(uuid.uuid4())
@@ -16,17 +32,98 @@ class BaseAgent(ABC):
         pass
     
     def log_decision(self, entry_id: str, decision: str) -> None:
-        """Log agent decision to memory"""
-        memory_store.add_agent_output(entry_id, self.name, {
-            "decision": decision,
-            "timestamp": datetime.now().isoformat(),
-            "agent_id": self.agent_id
-        })
-    
-    def extract_keywords(self, text: str, keywords: list) -> list:
+        """Queue agent decision for a background write to memory"""
+        record = (entry_id, self.name, decision, time.time(), self.agent_id)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to drain a queue; write through
+            BaseAgent._write_decisions([record])
+            return
+        BaseAgent._get_log_queue(loop).put_nowait(record)
+    
+    @staticmethod
+    async def flush_decisions() -> None:
+        """Wait until every queued decision has been written to memory"""
+        queue = BaseAgent._log_queue
+        if queue is not None and BaseAgent._log_loop is asyncio.get_running_loop():
+            await queue.join()
+    
+    @staticmethod
+    async def close_decision_log() -> None:
+        """Write every queued decision, then stop the background consumer"""
+        await BaseAgent.flush_decisions()
+        task = BaseAgent._log_task
+        if task is None or BaseAgent._log_loop is not asyncio.get_running_loop():
+            return
+        
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        BaseAgent._log_queue = None
+        BaseAgent._log_task = None
+        BaseAgent._log_loop = None
+    
+    @staticmethod
+    def _get_log_queue(loop: asyncio.AbstractEventLoop) -> asyncio.Queue:
+        """Return the decision queue for this loop, starting its consumer lazily"""
+        if BaseAgent._log_loop is not loop or BaseAgent._log_task is None or BaseAgent._log_task.done():
+            stale = BaseAgent._log_queue
+            if stale is not None and not stale.empty():
+                # Records left behind by a previous loop are written through
+                pending = []
+                while not stale.empty():
+                    pending.append(stale.get_nowait())
+                BaseAgent._write_decisions(pending)
+            
+            BaseAgent._log_queue = asyncio.Queue()
+            BaseAgent._log_loop = loop
+            BaseAgent._log_task = loop.create_task(BaseAgent._consume_decisions(BaseAgent._log_queue))
+        return BaseAgent._log_queue
+    
+    @staticmethod
+    async def _consume_decisions(queue: asyncio.Queue) -> None:
+        """Drain queued decisions in batches off the event loop"""
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < LOG_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await asyncio.to_thread(BaseAgent._write_decisions, batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    @staticmethod
+    def _write_decisions(batch: List[DecisionRecord]) -> None:
+        """Write decision records to memory"""
+        for entry_id, agent_name, decision, logged_at, agent_id in batch:
+            try:
+                memory_store.add_agent_output(entry_id, agent_name, {
+                    "decision": decision,
+                    "timestamp": datetime.fromtimestamp(logged_at).isoformat(),
+                    "agent_id": agent_id
+                })
+            except Exception as e:
+                print(f"Error logging agent decision: {e}")
+    
+    def build_keyword_matcher(self, keywords: Iterable[str]) -> KeywordMatcher:
+        """Build a reusable single-pass matcher for extract_keywords"""
+        return KeywordMatcher(keywords)
+    
+    def extract_keywords(self, text: str, keywords: Union[KeywordMatcher, list], text_lower: Optional[str] = None) -> list:
         """Extract keywords from text"""
         found_keywords = []
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
+        
+        # Prebuilt matcher: one scan, hits returned in keyword order (lowercased)
+        if isinstance(keywords, KeywordMatcher):
+            hits = keywords.find(text_lower)
+            return [keyword for keyword in keywords.keywords if keyword in hits]
+        
         for keyword in keywords:
             if keyword.lower() in text_lower:
                 found_keywords.append(keyword)
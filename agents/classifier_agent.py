@@ -1,9 +1,20 @@
+import asyncio
 import re
-from typing import Dict, Any
+import sys
+from typing import Dict, Any, List, Optional, Set
 from agents.base_agent import BaseAgent
 from models.schemas import ClassificationResult, FormatType, BusinessIntent
+from utils.keyword_matcher import KeywordMatcher
 
 class ClassifierAgent(BaseAgent):
+    __slots__ = (
+        "format_patterns", "intent_keywords",
+        "_format_literals", "_format_regexes", "_format_combined",
+        "_format_order", "_format_literal_groups", "_format_regex_ids",
+        "_urgency_re", "_email_re", "_reg_terms_re",
+        "_intent_matcher", "_intent_order", "_intent_ids_for"
+    )
+    
     def __init__(self):
         super().__init__("ClassifierAgent")
         
@@ -23,6 +34,37 @@ class ClassifierAgent(BaseAgent):
             ]
         }
         
+        # Compile format patterns once instead of on every request. Plain
+        # literals are matched with str methods on the lowercased input; only
+        # patterns with metacharacters go through the regex engine
+        self._format_literals: Dict[FormatType, List[str]] = {}
+        self._format_regexes: Dict[FormatType, List[re.Pattern]] = {}
+        self._format_combined: Dict[FormatType, Optional[re.Pattern]] = {}
+        for format_type, patterns in self.format_patterns.items():
+            literals = [pattern for pattern in patterns if re.escape(pattern) == pattern]
+            regexes = [pattern for pattern in patterns if re.escape(pattern) != pattern]
+            self._format_literals[format_type] = [literal.lower() for literal in literals]
+            self._format_regexes[format_type] = [re.compile(pattern, re.IGNORECASE) for pattern in regexes]
+            # One alternation per format so the regex patterns scan the input once
+            self._format_combined[format_type] = re.compile(
+                '|'.join(f'(?:{pattern})' for pattern in regexes), re.IGNORECASE
+            ) if regexes else None
+        # Flat score tables indexed by format id, so scoring is list arithmetic
+        self._format_order: List[FormatType] = list(self.format_patterns)
+        self._format_literal_groups = [
+            (tuple(self._format_literals[format_type]), format_id)
+            for format_id, format_type in enumerate(self._format_order)
+            if self._format_literals[format_type]
+        ]
+        self._format_regex_ids = [
+            (self._format_combined[format_type], format_id)
+            for format_id, format_type in enumerate(self._format_order)
+            if self._format_combined[format_type] is not None
+        ]
+        self._urgency_re = re.compile(r'urgent|asap|immediate', re.IGNORECASE)
+        self._email_re = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+        self._reg_terms_re = re.compile(r'policy|regulation|compliance')
+        
         self.intent_keywords = {
             BusinessIntent.RFQ: [
                 'request for quote', 'rfq', 'quotation', 'bid',
@@ -45,88 +87,128 @@ class ClassifierAgent(BaseAgent):
                 'security', 'breach', 'unauthorized', 'alert'
             ]
         }
+        
+        # Intern keywords so matcher hits compare by identity
+        self.intent_keywords = {
+            intent: [sys.intern(keyword) for keyword in keywords]
+            for intent, keywords in self.intent_keywords.items()
+        }
+        
+        # Single-pass matcher over every intent keyword
+        self._intent_matcher = KeywordMatcher(
+            keyword for keywords in self.intent_keywords.values() for keyword in keywords
+        )
+        
+        # Keyword -> intent ids lookup, so each hit bumps its intents' scores directly
+        self._intent_order: List[BusinessIntent] = list(self.intent_keywords)
+        self._intent_ids_for: Dict[str, List[int]] = {}
+        for intent_id, intent in enumerate(self._intent_order):
+            for keyword in self.intent_keywords[intent]:
+                self._intent_ids_for.setdefault(keyword.lower(), []).append(intent_id)
     
     async def process(self, input_data: str, classification: ClassificationResult = None, entry_id: str = None) -> ClassificationResult:
         """Classify input format and business intent"""
+        result = self._classify(input_data)
+        
+        if entry_id:
+            self.log_decision(entry_id, f"Classified as {result.format_type.value} with intent {result.business_intent.value}")
+        
+        return result
+    
+    async def process_batch(self, inputs: List[str], entry_ids: Optional[List[str]] = None) -> List[ClassificationResult]:
+        """Classify a batch of inputs in one worker-thread hop off the event loop"""
+        results = await asyncio.to_thread(lambda: [self._classify(input_data) for input_data in inputs])
+        
+        if entry_ids:
+            for entry_id, result in zip(entry_ids, results):
+                if entry_id:
+                    self.log_decision(entry_id, f"Classified as {result.format_type.value} with intent {result.business_intent.value}")
+        
+        return results
+    
+    def _classify(self, input_data: str) -> ClassificationResult:
+        """Run the synchronous classification pipeline on one input"""
+        # Lowercase once and share across the helpers below
+        text_lower = input_data.lower()
         
         # Detect format
-        format_type = self._detect_format(input_data)
+        format_type = self._detect_format(input_data, text_lower)
         
         # Detect business intent
-        business_intent = self._detect_intent(input_data)
+        intent_hits = self._intent_matcher.find(text_lower)
+        business_intent = self._detect_intent(intent_hits)
         
         # Calculate confidence
-        confidence = self._calculate_confidence(input_data, format_type, business_intent)
+        confidence = self._calculate_confidence(input_data, text_lower, format_type, business_intent, intent_hits)
         
         # Extract metadata
-        metadata = self._extract_metadata(input_data, format_type)
+        metadata = self._extract_metadata(input_data, text_lower, format_type)
         
-        result = ClassificationResult(
+        # Every field is already a valid enum or in-range value, so skip validation
+        result = ClassificationResult.model_construct(
             format_type=format_type,
             business_intent=business_intent,
             confidence_score=confidence,
             metadata=metadata
         )
         
-        if entry_id:
-            self.log_decision(entry_id, f"Classified as {format_type.value} with intent {business_intent.value}")
-        
         return result
     
-    def _detect_format(self, input_data: str) -> FormatType:
+    def _detect_format(self, input_data: str, text_lower: str) -> FormatType:
         """Detect input format using pattern matching"""
-        format_scores = {}
+        format_scores = [0] * len(self._format_order)
         
-        for format_type, patterns in self.format_patterns.items():
-            score = 0
-            for pattern in patterns:
-                matches = len(re.findall(pattern, input_data, re.IGNORECASE))
-                score += matches
-            format_scores[format_type] = score
+        # map() keeps the per-literal str.count calls in C, with no bytecode per literal
+        count = text_lower.count
+        for literals, format_id in self._format_literal_groups:
+            format_scores[format_id] += sum(map(count, literals))
+        for combined, format_id in self._format_regex_ids:
+            for _ in combined.finditer(input_data):
+                format_scores[format_id] += 1
         
-        # Return format with highest score
+        # Return format with highest score (first declared wins ties)
         if format_scores:
-            best_format = max(format_scores, key=format_scores.get)
-            if format_scores[best_format] > 0:
-                return best_format
+            best_id = max(range(len(format_scores)), key=format_scores.__getitem__)
+            if format_scores[best_id] > 0:
+                return self._format_order[best_id]
         
         # Default fallback
         if input_data.strip().startswith('{'):
             return FormatType.JSON
-        elif '@' in input_data and ('subject:' in input_data.lower() or 'from:' in input_data.lower()):
+        elif '@' in input_data and ('subject:' in text_lower or 'from:' in text_lower):
             return FormatType.EMAIL
         else:
             return FormatType.PDF
     
-    def _detect_intent(self, input_data: str) -> BusinessIntent:
+    def _detect_intent(self, intent_hits: Set[str]) -> BusinessIntent:
         """Detect business intent using keyword matching"""
-        intent_scores = {}
+        intent_scores = [0] * len(self._intent_order)
         
-        for intent, keywords in self.intent_keywords.items():
-            score = 0
-            for keyword in keywords:
-                if keyword.lower() in input_data.lower():
-                    score += 1
-            intent_scores[intent] = score
+        for keyword in intent_hits:
+            for intent_id in self._intent_ids_for[keyword]:
+                intent_scores[intent_id] += 1
         
-        # Return intent with highest score
+        # Return intent with highest score (first declared wins ties)
         if intent_scores:
-            best_intent = max(intent_scores, key=intent_scores.get)
-            if intent_scores[best_intent] > 0:
-                return best_intent
+            best_id = max(range(len(intent_scores)), key=intent_scores.__getitem__)
+            if intent_scores[best_id] > 0:
+                return self._intent_order[best_id]
         
         return BusinessIntent.UNKNOWN
     
-    def _calculate_confidence(self, input_data: str, format_type: FormatType, business_intent: BusinessIntent) -> float:
+    def _calculate_confidence(self, input_data: str, text_lower: str, format_type: FormatType, business_intent: BusinessIntent, intent_hits: Set[str]) -> float:
         """Calculate confidence score based on pattern matches"""
         format_matches = 0
-        for pattern in self.format_patterns.get(format_type, []):
-            if re.search(pattern, input_data, re.IGNORECASE):
+        for literal in self._format_literals.get(format_type, []):
+            if literal in text_lower:
+                format_matches += 1
+        for regex in self._format_regexes.get(format_type, []):
+            if regex.search(input_data):
                 format_matches += 1
         
         intent_matches = 0
         for keyword in self.intent_keywords.get(business_intent, []):
-            if keyword.lower() in input_data.lower():
+            if keyword.lower() in intent_hits:
                 intent_matches += 1
         
         total_format_patterns = len(self.format_patterns.get(format_type, []))
@@ -137,7 +219,7 @@ class ClassifierAgent(BaseAgent):
         
         return (format_confidence + intent_confidence) / 2
     
-    def _extract_metadata(self, input_data: str, format_type: FormatType) -> Dict[str, Any]:
+    def _extract_metadata(self, input_data: str, text_lower: str, format_type: FormatType) -> Dict[str, Any]:
         """Extract format-specific metadata"""
         metadata = {
             "length": len(input_data),
@@ -147,23 +229,23 @@ class ClassifierAgent(BaseAgent):
         
         if format_type == FormatType.EMAIL:
             # Extract email-specific metadata
-            if re.search(r'urgent|asap|immediate', input_data, re.IGNORECASE):
+            if self._urgency_re.search(input_data):
                 metadata["urgency_indicators"] = True
             
-            email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', input_data)
+            email_match = self._email_re.search(input_data)
             if email_match:
                 metadata["sender_domain"] = email_match.group().split('@')[1]
         
         elif format_type == FormatType.JSON:
             # Check for webhook indicators
-            if 'webhook' in input_data.lower():
+            if 'webhook' in text_lower:
                 metadata["webhook_detected"] = True
         
         elif format_type == FormatType.PDF:
             # Check for document type indicators
-            if 'invoice' in input_data.lower():
+            if 'invoice' in text_lower:
                 metadata["document_type"] = "invoice"
-            elif any(term in input_data.lower() for term in ['policy', 'regulation', 'compliance']):
+            elif self._reg_terms_re.search(text_lower):
                 metadata["document_type"] = "regulation"
         
         return metadata
\ No newline at end of file
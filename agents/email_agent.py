@@ -1,10 +1,20 @@
 import re
-from typing import Dict, Any
+import sys
+from typing import Dict, Any, Set
 from datetime import datetime
 from agents.base_agent import BaseAgent
 from models.schemas import ClassificationResult, EmailData, Urgency, Tone
+from utils.keyword_matcher import KeywordMatcher
 
 class EmailAgent(BaseAgent):
+    __slots__ = (
+        "urgency_keywords", "tone_keywords",
+        "_urgency_matcher", "_tone_matcher", "_urgency_buckets", "_tone_buckets",
+        "_exclamation_re", "_deadline_re", "_caps_word_re",
+        "_headers_re", "_subject_prefix_re", "_blank_line_re",
+        "_request_re", "_issue_re"
+    )
+    
     def __init__(self):
         super().__init__("EmailAgent")
         
@@ -22,16 +32,68 @@ class EmailAgent(BaseAgent):
             Tone.POLITE: ['please', 'thank you', 'appreciate', 'kindly'],
             Tone.NEUTRAL: []  # Default fallback
         }
+        
+        # Intern keywords so matcher hits compare by identity
+        self.urgency_keywords = {
+            urgency: [sys.intern(keyword) for keyword in keywords]
+            for urgency, keywords in self.urgency_keywords.items()
+        }
+        self.tone_keywords = {
+            tone: [sys.intern(keyword) for keyword in keywords]
+            for tone, keywords in self.tone_keywords.items()
+        }
+        
+        # Single-pass matchers; kept separate since 'please' belongs to both families
+        self._urgency_matcher = KeywordMatcher(
+            keyword for keywords in self.urgency_keywords.values() for keyword in keywords
+        )
+        self._tone_matcher = KeywordMatcher(
+            keyword for keywords in self.tone_keywords.values() for keyword in keywords
+        )
+        
+        # Priority-ordered buckets checked against the hit sets with early exit
+        self._urgency_buckets = [
+            (urgency, frozenset(keywords)) for urgency, keywords in self.urgency_keywords.items() if keywords
+        ]
+        self._tone_buckets = [
+            (tone, frozenset(keywords)) for tone, keywords in self.tone_keywords.items() if keywords
+        ]
+        
+        # Fallback patterns compiled once
+        self._exclamation_re = re.compile(r'!{2,}')
+        self._deadline_re = re.compile(r'by\s+(?:today|tomorrow|end of day|eod)')
+        self._caps_word_re = re.compile(r'\b[A-Z]{3,}\b')
+        
+        # One scan for all headers. The zero-width lookahead lets matches
+        # overlap, so each group's first hit is exactly what a separate
+        # search for that header would find
+        self._headers_re = re.compile(
+            r'(?=from:\s*(?P<sender>[\w\.-]+@[\w\.-]+\.\w+)'
+            r'|subject:\s*(?P<subject>[^\n]+)'
+            r'|to:\s*(?P<recipient>[\w\.-]+@[\w\.-]+\.\w+))',
+            re.IGNORECASE
+        )
+        self._subject_prefix_re = re.compile(r'subject:', re.IGNORECASE)
+        self._blank_line_re = re.compile(r'\n[^\S\n]*\n')
+        self._request_re = re.compile(r'request(?:ing)?\s+(.+?)(?:\.|$)', re.IGNORECASE)
+        self._issue_re = re.compile(r'(?:problem|issue)\s+(?:is\s+)?(.+?)(?:\.|$)', re.IGNORECASE)
     
     async def process(self, input_data: str, classification: ClassificationResult, entry_id: str) -> Dict[str, Any]:
         """Process email data and extract structured information"""
         
+        # Lowercase once and share across the helpers below
+        text_lower = input_data.lower()
+        
         # Extract email fields
-        email_data = self._extract_email_fields(input_data)
+        email_data = self._extract_email_fields(input_data, text_lower)
+        
+        # Scan for urgency and tone keywords once
+        urgency_hits = self._urgency_matcher.find(text_lower)
+        tone_hits = self._tone_matcher.find(text_lower)
         
         # Determine urgency and tone
-        urgency = self._determine_urgency(input_data)
-        tone = self._determine_tone(input_data)
+        urgency = self._determine_urgency(input_data, text_lower, urgency_hits)
+        tone = self._determine_tone(input_data, text_lower, tone_hits)
         
         # Create structured result
         result = {
@@ -48,7 +110,7 @@ class EmailAgent(BaseAgent):
             "recommended_actions": self._recommend_actions(urgency, tone),
             "processing_metadata": {
                 "confidence": classification.confidence_score,
-                "keywords_found": self._extract_keywords_found(input_data)
+                "keywords_found": self._extract_keywords_found(urgency_hits, tone_hits)
             }
         }
         
@@ -57,80 +119,80 @@ class EmailAgent(BaseAgent):
         
         return result
     
-    def _extract_email_fields(self, email_text: str) -> Dict[str, Any]:
+    def _extract_email_fields(self, email_text: str, text_lower: str) -> Dict[str, Any]:
         """Extract structured fields from email text"""
         fields = {}
         
-        # Extract sender
-        sender_match = re.search(r'from:\s*([\w\.-]+@[\w\.-]+\.\w+)', email_text, re.IGNORECASE)
-        if sender_match:
-            fields["sender"] = sender_match.group(1)
-        
-        # Extract subject
-        subject_match = re.search(r'subject:\s*(.+?)(?:\n|$)', email_text, re.IGNORECASE)
-        if subject_match:
-            fields["subject"] = subject_match.group(1).strip()
-        
-        # Extract recipient
-        to_match = re.search(r'to:\s*([\w\.-]+@[\w\.-]+\.\w+)', email_text, re.IGNORECASE)
-        if to_match:
-            fields["recipient"] = to_match.group(1)
-        
-        # Extract body (everything after headers)
-        body_match = re.search(r'(?:subject:.*?\n\s*\n|^)(.*)', email_text, re.IGNORECASE | re.DOTALL)
-        if body_match:
-            fields["body"] = body_match.group(1).strip()
-        else:
-            fields["body"] = email_text
+        # Extract sender, subject and recipient in one pass, keeping the first hit of each
+        headers = {}
+        for match in self._headers_re.finditer(email_text):
+            header = match.lastgroup
+            if header not in headers:
+                headers[header] = match.group(header)
+                if len(headers) == 3:
+                    break
+        
+        if "sender" in headers:
+            fields["sender"] = headers["sender"]
+        if "subject" in headers:
+            fields["subject"] = headers["subject"].strip()
+        if "recipient" in headers:
+            fields["recipient"] = headers["recipient"]
+        
+        # Extract body (everything after the first blank line when the text opens with a subject)
+        body_start = 0
+        subject_prefix = self._subject_prefix_re.match(email_text)
+        if subject_prefix:
+            blank_line = self._blank_line_re.search(email_text, subject_prefix.end())
+            if blank_line:
+                body_start = blank_line.end()
+        fields["body"] = email_text[body_start:].strip()
         
         # Extract specific requests or issues
-        if 'request' in email_text.lower():
-            request_match = re.search(r'request(?:ing)?\s+(.+?)(?:\.|$)', email_text, re.IGNORECASE)
+        if 'request' in text_lower:
+            request_match = self._request_re.search(email_text)
             if request_match:
                 fields["request"] = request_match.group(1).strip()
         
-        if 'problem' in email_text.lower() or 'issue' in email_text.lower():
-            issue_match = re.search(r'(?:problem|issue)\s+(?:is\s+)?(.+?)(?:\.|$)', email_text, re.IGNORECASE)
+        if 'problem' in text_lower or 'issue' in text_lower:
+            issue_match = self._issue_re.search(email_text)
             if issue_match:
                 fields["issue"] = issue_match.group(1).strip()
         
         return fields
     
-    def _determine_urgency(self, email_text: str) -> Urgency:
+    def _determine_urgency(self, email_text: str, text_lower: str, urgency_hits: Set[str]) -> Urgency:
         """Determine email urgency based on keywords and patterns"""
-        text_lower = email_text.lower()
-        
         # Check for urgency keywords
-        for urgency, keywords in self.urgency_keywords.items():
-            for keyword in keywords:
-                if keyword in text_lower:
+        if urgency_hits:
+            for urgency, bucket in self._urgency_buckets:
+                if not bucket.isdisjoint(urgency_hits):
                     return urgency
         
         # Check for punctuation patterns (multiple exclamation marks)
-        if re.search(r'!{2,}', email_text):
+        if self._exclamation_re.search(email_text):
             return Urgency.HIGH
         
         # Check for time constraints
-        if re.search(r'by\s+(?:today|tomorrow|end of day|eod)', text_lower):
+        if self._deadline_re.search(text_lower):
             return Urgency.HIGH
         
         return Urgency.MEDIUM  # Default
     
-    def _determine_tone(self, email_text: str) -> Tone:
+    def _determine_tone(self, email_text: str, text_lower: str, tone_hits: Set[str]) -> Tone:
         """Determine email tone based on keywords and patterns"""
-        text_lower = email_text.lower()
-        
         # Check for tone keywords
-        for tone, keywords in self.tone_keywords.items():
-            for keyword in keywords:
-                if keyword in text_lower:
+        if tone_hits:
+            for tone, bucket in self._tone_buckets:
+                if not bucket.isdisjoint(tone_hits):
                     return tone
         
         # Check for caps (shouting)
-        caps_words = len(re.findall(r'\b[A-Z]{3,}\b', email_text))
         total_words = len(email_text.split())
-        if total_words > 0 and caps_words / total_words > 0.3:
-            return Tone.ANGRY
+        if total_words > 0:
+            caps_words = sum(1 for _ in self._caps_word_re.finditer(email_text))
+            if caps_words / total_words > 0.3:
+                return Tone.ANGRY
         
         # Check for polite indicators
         if any(word in text_lower for word in ['please', 'thank', 'appreciate']):
@@ -156,23 +218,21 @@ class EmailAgent(BaseAgent):
         
         return actions
     
-    def _extract_keywords_found(self, email_text: str) -> Dict[str, list]:
+    def _extract_keywords_found(self, urgency_hits: Set[str], tone_hits: Set[str]) -> Dict[str, list]:
         """Extract all keywords found for metadata"""
         found_keywords = {
             "urgency": [],
             "tone": []
         }
         
-        text_lower = email_text.lower()
-        
         for urgency, keywords in self.urgency_keywords.items():
             for keyword in keywords:
-                if keyword in text_lower:
+                if keyword in urgency_hits:
                     found_keywords["urgency"].append(keyword)
         
         for tone, keywords in self.tone_keywords.items():
             for keyword in keywords:
-                if keyword in text_lower:
+                if keyword in tone_hits:
                     found_keywords["tone"].append(keyword)
         
         return found_keywords
\ No newline at end of file
@@ -1,10 +1,39 @@
-import json
-from typing import Dict, Any, List
+import re
+import orjson
+from typing import AbstractSet, Dict, Any, List
 from datetime import datetime
 from agents.base_agent import BaseAgent
 from models.schemas import ClassificationResult, JSONData
 
+# Anomaly labels in report order; bit i of an anomaly mask maps to ANOMALY_LABELS[i]
+ANOMALY_LABELS = (
+    "negative_amount",
+    "unusually_high_amount",
+    "invalid_amount_format",
+    "invalid_timestamp_range",
+    "malformed_timestamp",
+    "empty_items_array",
+    "suspicious_status_value"
+)
+
+SUSPICIOUS_STATUSES = frozenset({"test", "debug", "fake", "dummy"})
+
+# Exactly the (stripped) strings float() accepts, so amounts parse without try/except
+_DIGITS = r'\d(?:_?\d)*'
+NUMERIC_STRING_RE = re.compile(
+    rf'[+-]?(?:(?:{_DIGITS}(?:\.(?:{_DIGITS})?)?|\.{_DIGITS})(?:[eE][+-]?{_DIGITS})?|inf(?:inity)?|nan)',
+    re.IGNORECASE
+)
+
+# Every ISO 8601 form datetime.fromisoformat accepts starts with a 4-digit year
+ISO_YEAR_PREFIX_RE = re.compile(r'[0-9]{4}')
+
 class JSONAgent(BaseAgent):
+    __slots__ = (
+        "webhook_schemas", "anomaly_patterns",
+        "_required_sets", "_webhook_indicators", "_important_fields", "_important_fields_set"
+    )
+    
     def __init__(self):
         super().__init__("JSONAgent")
         
@@ -28,6 +57,26 @@ class JSONAgent(BaseAgent):
             }
         }
         
+        # Required-field sets for C-level difference against the payload keys
+        self._required_sets = {
+            webhook_type: frozenset(schema["required_fields"])
+            for webhook_type, schema in self.webhook_schemas.items()
+        }
+        
+        # Indicator fields per webhook type, checked in priority order
+        self._webhook_indicators = [
+            ("payment", frozenset({"transaction_id", "payment_id", "amount", "currency"})),
+            ("user_event", frozenset({"user_id", "event_type", "session_id"})),
+            ("order", frozenset({"order_id", "customer_id", "items"})),
+            ("system_alert", frozenset({"alert_type", "severity", "message"}))
+        ]
+        
+        self._important_fields = (
+            "user_id", "customer_id", "transaction_id", "order_id",
+            "amount", "currency", "status", "timestamp", "event_type"
+        )
+        self._important_fields_set = frozenset(self._important_fields)
+        
         self.anomaly_patterns = [
             "missing_required_field",
             "type_mismatch",
@@ -42,19 +91,22 @@ class JSONAgent(BaseAgent):
         
         try:
             # Parse JSON
-            json_data = json.loads(input_data)
+            json_data = orjson.loads(input_data)
+            
+            # Field presence checks below all go through this one keys view
+            keys = json_data.keys() if isinstance(json_data, dict) else frozenset()
             
             # Detect webhook type
-            webhook_type = self._detect_webhook_type(json_data)
+            webhook_type = self._detect_webhook_type(json_data, keys)
             
             # Validate schema
-            schema_valid, validation_errors = self._validate_schema(json_data, webhook_type)
+            schema_valid, validation_errors = self._validate_schema(json_data, keys, webhook_type)
             
             # Detect anomalies
-            anomalies = self._detect_anomalies(json_data, webhook_type)
+            anomalies = self._detect_anomalies(json_data, keys, webhook_type)
             
             # Extract structured fields
-            extracted_fields = self._extract_fields(json_data)
+            extracted_fields = self._extract_fields(json_data, keys)
             
             result = {
                 "agent": self.name,
@@ -77,7 +129,7 @@ class JSONAgent(BaseAgent):
             # Log decision
             self.log_decision(entry_id, f"JSON processed - Type: {webhook_type}, Valid: {schema_valid}, Anomalies: {len(anomalies)}")
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             result = {
                 "agent": self.name,
                 "json_data": {
@@ -100,30 +152,19 @@ class JSONAgent(BaseAgent):
         
         return result
     
-    def _detect_webhook_type(self, json_data: Dict[str, Any]) -> str:
+    def _detect_webhook_type(self, json_data: Dict[str, Any], keys: AbstractSet[str]) -> str:
         """Detect the type of webhook based on field patterns"""
         if not isinstance(json_data, dict):
             return "unknown"
         
-        # Check for payment webhook
-        if any(field in json_data for field in ["transaction_id", "payment_id", "amount", "currency"]):
-            return "payment"
-        
-        # Check for user event webhook
-        if any(field in json_data for field in ["user_id", "event_type", "session_id"]):
-            return "user_event"
-        
-        # Check for order webhook
-        if any(field in json_data for field in ["order_id", "customer_id", "items"]):
-            return "order"
-        
-        # Check for system alert
-        if any(field in json_data for field in ["alert_type", "severity", "message"]):
-            return "system_alert"
+        # First type whose indicator fields overlap the payload keys
+        for webhook_type, indicators in self._webhook_indicators:
+            if not indicators.isdisjoint(keys):
+                return webhook_type
         
         return "generic"
     
-    def _validate_schema(self, json_data: Dict[str, Any], webhook_type: str) -> tuple[bool, List[str]]:
+    def _validate_schema(self, json_data: Dict[str, Any], keys: AbstractSet[str], webhook_type: str) -> tuple[bool, List[str]]:
         """Validate JSON against expected schema"""
         errors = []
         
@@ -133,94 +174,100 @@ class JSONAgent(BaseAgent):
         schema = self.webhook_schemas[webhook_type]
         
         # Check required fields
-        for field in schema["required_fields"]:
-            if field not in json_data:
-                errors.append(f"Missing required field: {field}")
-            elif json_data[field] is None:
-                errors.append(f"Required field '{field}' is null")
+        required = self._required_sets[webhook_type]
+        missing = required.difference(keys)
+        nulls = {field for field in required - missing if json_data[field] is None}
+        if missing or nulls:
+            # Report in declared field order
+            for field in schema["required_fields"]:
+                if field in missing:
+                    errors.append(f"Missing required field: {field}")
+                elif field in nulls:
+                    errors.append(f"Required field '{field}' is null")
         
         # Type validation
-        self._validate_field_types(json_data, errors)
+        self._validate_field_types(json_data, keys, errors)
         
         return len(errors) == 0, errors
     
-    def _validate_field_types(self, json_data: Dict[str, Any], errors: List[str]) -> None:
+    def _validate_field_types(self, json_data: Dict[str, Any], keys: AbstractSet[str], errors: List[str]) -> None:
         """Validate field types"""
         # Amount fields should be numeric
-        if "amount" in json_data and not isinstance(json_data["amount"], (int, float)):
+        if "amount" in keys and not isinstance(json_data["amount"], (int, float)):
             errors.append("Field 'amount' should be numeric")
         
         # Timestamp fields should be strings or numbers
-        if "timestamp" in json_data:
+        if "timestamp" in keys:
             if not isinstance(json_data["timestamp"], (str, int, float)):
                 errors.append("Field 'timestamp' should be string or number")
         
         # ID fields should be strings or numbers
-        for field in json_data:
+        for field in keys:
             if field.endswith("_id") and not isinstance(json_data[field], (str, int)):
                 errors.append(f"ID field '{field}' should be string or number")
     
-    def _detect_anomalies(self, json_data: Dict[str, Any], webhook_type: str) -> List[str]:
+    def _detect_anomalies(self, json_data: Dict[str, Any], keys: AbstractSet[str], webhook_type: str) -> List[str]:
         """Detect anomalies in JSON data"""
-        anomalies = []
+        # Bit i set means ANOMALY_LABELS[i] was detected
+        mask = 0
         
         # Check for suspicious amounts
-        if "amount" in json_data:
-            try:
-                amount = float(json_data["amount"])
-                if amount < 0:
-                    anomalies.append("negative_amount")
-                elif amount > 100000:  # Configurable threshold
-                    anomalies.append("unusually_high_amount")
-            except (ValueError, TypeError):
-                anomalies.append("invalid_amount_format")
+        if "amount" in keys:
+            amount = json_data["amount"]
+            if isinstance(amount, str) and NUMERIC_STRING_RE.fullmatch(amount.strip()):
+                amount = float(amount)
+            if isinstance(amount, (int, float)):
+                mask |= (amount < 0) | (amount > 100000) << 1  # Configurable threshold
+            else:
+                mask |= 1 << 2
         
         # Check for unusual timestamps
-        if "timestamp" in json_data:
-            try:
-                if isinstance(json_data["timestamp"], str):
-                    # Try to parse timestamp
-                    datetime.fromisoformat(json_data["timestamp"].replace('Z', '+00:00'))
-                elif isinstance(json_data["timestamp"], (int, float)):
-                    # Unix timestamp validation
-                    if json_data["timestamp"] < 0 or json_data["timestamp"] > 2147483647:
-                        anomalies.append("invalid_timestamp_range")
-            except ValueError:
-                anomalies.append("malformed_timestamp")
+        if "timestamp" in keys:
+            timestamp = json_data["timestamp"]
+            if isinstance(timestamp, str):
+                # Reject non-ISO shapes up front; the parse only catches
+                # out-of-range fields such as month 13
+                if not ISO_YEAR_PREFIX_RE.match(timestamp):
+                    mask |= 1 << 4
+                else:
+                    # Only a trailing 'Z' needs rewriting
+                    if timestamp.endswith('Z'):
+                        timestamp = timestamp[:-1] + '+00:00'
+                    try:
+                        datetime.fromisoformat(timestamp)
+                    except ValueError:
+                        mask |= 1 << 4
+            elif isinstance(timestamp, (int, float)):
+                # Unix timestamp validation
+                mask |= (timestamp < 0 or timestamp > 2147483647) << 3
         
         # Check for empty required arrays
-        if webhook_type == "order" and "items" in json_data:
-            if isinstance(json_data["items"], list) and len(json_data["items"]) == 0:
-                anomalies.append("empty_items_array")
+        if webhook_type == "order" and "items" in keys:
+            mask |= (isinstance(json_data["items"], list) and len(json_data["items"]) == 0) << 5
         
         # Check for suspicious field values
-        if "status" in json_data:
-            suspicious_statuses = ["test", "debug", "fake", "dummy"]
-            if str(json_data["status"]).lower() in suspicious_statuses:
-                anomalies.append("suspicious_status_value")
+        if "status" in keys:
+            mask |= (str(json_data["status"]).lower() in SUSPICIOUS_STATUSES) << 6
         
-        return anomalies
+        return [label for bit, label in enumerate(ANOMALY_LABELS) if mask >> bit & 1]
     
-    def _extract_fields(self, json_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_fields(self, json_data: Dict[str, Any], keys: AbstractSet[str]) -> Dict[str, Any]:
         """Extract important fields for further processing"""
         extracted = {}
         
-        # Extract common fields
-        important_fields = [
-            "user_id", "customer_id", "transaction_id", "order_id",
-            "amount", "currency", "status", "timestamp", "event_type"
-        ]
-        
-        for field in important_fields:
-            if field in json_data:
-                extracted[field] = json_data[field]
+        # Extract common fields, keeping the declared field order
+        present = self._important_fields_set.intersection(keys)
+        if present:
+            for field in self._important_fields:
+                if field in present:
+                    extracted[field] = json_data[field]
         
         # Extract nested data
-        if "data" in json_data and isinstance(json_data["data"], dict):
+        if "data" in keys and isinstance(json_data["data"], dict):
             extracted["nested_data_keys"] = list(json_data["data"].keys())
         
         # Calculate payload size
-        extracted["payload_size"] = len(str(json_data))
+        extracted["payload_size"] = len(orjson.dumps(json_data))
         extracted["field_count"] = len(json_data)
         
         return extracted
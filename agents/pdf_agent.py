@@ -1,11 +1,53 @@
+import asyncio
 import re
-from typing import Dict, Any, List
+from itertools import chain, islice
+from typing import Dict, Any, List, Set, Tuple
 from datetime import datetime
 from agents.base_agent import BaseAgent
-from models.schemas import ClassificationResult, PDFData
+from models.schemas import ClassificationResult, ComplianceFlag, PDFData
 from utils.pdf_parser import PDFParser
+from utils.keyword_matcher import KeywordMatcher
+from utils.executors import get_cpu_pool
 
 class PDFAgent(BaseAgent):
+    invoice_patterns = {
+        "total": [r'total[:\s]+\$?(\d+(?:,\d{3})*(?:\.\d{2})?)', r'amount due[:\s]+\$?(\d+(?:,\d{3})*(?:\.\d{2})?)'],
+        "invoice_number": [r'invoice\s*#?\s*:?\s*(\w+)', r'inv\s*#?\s*:?\s*(\w+)'],
+        "date": [r'date[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})'],
+        "vendor": [r'from[:\s]+([^\n]+)', r'vendor[:\s]+([^\n]+)']
+    }
+    
+    # Patterns compiled once at class load
+    _INVOICE_RES = {
+        field: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        for field, patterns in invoice_patterns.items()
+    }
+    _LINE_ITEM_RE = re.compile(r'(\d+)\s+(.+?)\s+\$?(\d+(?:,\d{3})*(?:\.\d{2})?)')
+    _SSN_RE = re.compile(r'\b\d{3}-\d{2}-\d{4}\b')
+    _CREDIT_CARD_RE = re.compile(r'\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b')
+    _URGENCY_TERMS = frozenset({"urgent", "asap", "immediate", "critical"})
+    
+    # Document type indicators in priority order
+    _DOCUMENT_TYPES = (
+        ("invoice", frozenset({"invoice", "bill", "payment", "amount due"})),
+        ("policy", frozenset({"policy", "regulation", "compliance", "gdpr", "fda"})),
+        ("contract", frozenset({"contract", "agreement", "terms"})),
+        ("report", frozenset({"report", "analysis", "summary"}))
+    )
+    _DATE_RES = (
+        re.compile(r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b'),
+        re.compile(r'\b(\d{4}-\d{2}-\d{2})\b')
+    )
+    _AMOUNT_RE = re.compile(r'\$(\d+(?:,\d{3})*(?:\.\d{2})?)')
+    _EMAIL_RE = re.compile(r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b')
+    _PHONE_RE = re.compile(r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b')
+    _KV_RE = re.compile(r'(\w+):\s*([^\n]+)')
+    # Cheap gate for the digit-based patterns above
+    _DIGIT_RE = re.compile(r'\d')
+    
+    # (bit, reported name) in report order
+    _FLAG_NAMES = tuple((flag, flag.name.lower()) for flag in ComplianceFlag)
+    
     def __init__(self):
         super().__init__("PDFAgent")
         self.pdf_parser = PDFParser()
@@ -15,22 +57,41 @@ class PDFAgent(BaseAgent):
             "regulation", "policy", "audit", "security"
         ]
         
-        self.invoice_patterns = {
-            "total": [r'total[:\s]+\$?(\d+(?:,\d{3})*(?:\.\d{2})?)', r'amount due[:\s]+\$?(\d+(?:,\d{3})*(?:\.\d{2})?)'],
-            "invoice_number": [r'invoice\s*#?\s*:?\s*(\w+)', r'inv\s*#?\s*:?\s*(\w+)'],
-            "date": [r'date[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})'],
-            "vendor": [r'from[:\s]+(.+?)(?:\n|$)', r'vendor[:\s]+(.+?)(?:\n|$)']
-        }
+        # One scan yields document type, compliance, regulatory and urgency literal hits
+        self._keyword_matcher = KeywordMatcher([
+            *(keyword for _, keywords in self._DOCUMENT_TYPES for keyword in keywords),
+            *self.compliance_keywords,
+            *self._URGENCY_TERMS
+        ])
+        self._compliance_flags = [
+            (keyword.lower(), ComplianceFlag[f"CONTAINS_{keyword.upper()}"])
+            for keyword in self.compliance_keywords
+        ]
     
     async def process(self, input_data: str, classification: ClassificationResult, entry_id: str) -> Dict[str, Any]:
         """Process PDF data and extract structured information"""
+        # The extraction is CPU-bound, so run it in a worker process and keep the event loop free
+        loop = asyncio.get_running_loop()
+        result, decision = await loop.run_in_executor(get_cpu_pool(), self._process_sync, input_data, classification)
+        
+        # Log decision
+        self.log_decision(entry_id, decision)
+        
+        return result
+    
+    def _process_sync(self, input_data: str, classification: ClassificationResult) -> Tuple[Dict[str, Any], str]:
+        """Extract structured information from PDF text, returning the result and its decision log line"""
         
         # For this implementation, we'll treat input_data as extracted text
         # In production, this would use actual PDF parsing
         extracted_text = input_data
         
+        # Lowercase once and collect every keyword hit in a single scan
+        text_lower = extracted_text.lower()
+        keyword_hits = self._keyword_matcher.find(text_lower)
+        
         # Determine document type
-        document_type = self._determine_document_type(extracted_text)
+        document_type = self._determine_document_type(keyword_hits)
         
         # Extract structured data based on type
         if document_type == "invoice":
@@ -39,7 +100,8 @@ class PDFAgent(BaseAgent):
             line_items, total_amount = [], None
         
         # Check for compliance flags
-        flags = self._check_compliance_flags(extracted_text, document_type, total_amount)
+        flag_mask = self._check_compliance_flags(extracted_text, keyword_hits, document_type, total_amount)
+        flags = [name for flag, name in self._FLAG_NAMES if flag_mask & flag]
         
         # Extract general fields
         extracted_fields = self._extract_general_fields(extracted_text, document_type)
@@ -48,48 +110,41 @@ class PDFAgent(BaseAgent):
             "agent": self.name,
             "pdf_data": {
                 "document_type": document_type,
-                "extracted_text": extracted_text[:500] + "..." if len(extracted_text) > 500 else extracted_text,
+                "extracted_text": f"{extracted_text[:500]}..." if len(extracted_text) > 500 else extracted_text,
                 "line_items": line_items,
                 "total_amount": total_amount,
                 "flags": flags,
                 "extracted_fields": extracted_fields
             },
-            "recommended_actions": self._recommend_actions(flags, total_amount, document_type),
+            "recommended_actions": self._recommend_actions(flag_mask, total_amount, document_type),
             "processing_metadata": {
                 "text_length": len(extracted_text),
-                "line_count": len(extracted_text.split('\n')),
+                "line_count": extracted_text.count('\n') + 1,
                 "confidence": classification.confidence_score
             }
         }
         
-        # Log decision
-        self.log_decision(entry_id, f"PDF processed - Type: {document_type}, Flags: {len(flags)}, Total: {total_amount}")
-        
-        return result
+        return result, f"PDF processed - Type: {document_type}, Flags: {len(flags)}, Total: {total_amount}"
     
-    def _determine_document_type(self, text: str) -> str:
+    def _determine_document_type(self, keyword_hits: Set[str]) -> str:
         """Determine the type of PDF document"""
-        text_lower = text.lower()
-        
-        if any(keyword in text_lower for keyword in ["invoice", "bill", "payment", "amount due"]):
-            return "invoice"
-        elif any(keyword in text_lower for keyword in ["policy", "regulation", "compliance", "gdpr", "fda"]):
-            return "policy"
-        elif any(keyword in text_lower for keyword in ["contract", "agreement", "terms"]):
-            return "contract"
-        elif any(keyword in text_lower for keyword in ["report", "analysis", "summary"]):
-            return "report"
-        else:
-            return "document"
+        for document_type, keywords in self._DOCUMENT_TYPES:
+            if not keywords.isdisjoint(keyword_hits):
+                return document_type
+        return "document"
     
     def _extract_invoice_data(self, text: str) -> tuple[List[Dict[str, Any]], float]:
         """Extract line items and total from invoice"""
         line_items = []
         total_amount = None
         
+        # Totals and line items all need digits
+        if not self._DIGIT_RE.search(text):
+            return line_items, total_amount
+        
         # Extract total amount
-        for pattern in self.invoice_patterns["total"]:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for regex in self._INVOICE_RES["total"]:
+            match = regex.search(text)
             if match:
                 try:
                     amount_str = match.group(1).replace(',', '')
@@ -99,8 +154,7 @@ class PDFAgent(BaseAgent):
                     continue
         
         # Extract line items (simplified pattern)
-        line_pattern = r'(\d+)\s+(.+?)\s+\$?(\d+(?:,\d{3})*(?:\.\d{2})?)'
-        matches = re.findall(line_pattern, text)
+        matches = self._LINE_ITEM_RE.findall(text)
         
         for match in matches:
             try:
@@ -114,130 +168,131 @@ class PDFAgent(BaseAgent):
         
         return line_items, total_amount
     
-    def _check_compliance_flags(self, text: str, document_type: str, total_amount: float) -> List[str]:
+    def _check_compliance_flags(self, text: str, keyword_hits: Set[str], document_type: str, total_amount: float) -> ComplianceFlag:
         """Check for compliance and risk flags"""
-        flags = []
-        text_lower = text.lower()
+        flags = ComplianceFlag(0)
         
         # Check for high-value invoice
         if document_type == "invoice" and total_amount and total_amount > 10000:
-            flags.append("high_value_invoice")
+            flags |= ComplianceFlag.HIGH_VALUE_INVOICE
         
         # Check for compliance keywords
-        found_compliance = self.extract_keywords(text, self.compliance_keywords)
-        if found_compliance:
-            flags.append("compliance_document")
-            for keyword in found_compliance:
-                flags.append(f"contains_{keyword.lower()}")
+        for keyword, flag in self._compliance_flags:
+            if keyword in keyword_hits:
+                flags |= ComplianceFlag.COMPLIANCE_DOCUMENT | flag
         
         # Check for specific regulatory mentions
-        if "gdpr" in text_lower:
-            flags.append("gdpr_related")
-        if "fda" in text_lower:
-            flags.append("fda_related")
-        if "sox" in text_lower:
-            flags.append("sox_compliance")
-        
-        # Check for sensitive information patterns
-        if re.search(r'\b\d{3}-\d{2}-\d{4}\b', text):  # SSN pattern
-            flags.append("contains_ssn")
-        if re.search(r'\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b', text):  # Credit card pattern
-            flags.append("contains_credit_card")
+        if "gdpr" in keyword_hits:
+            flags |= ComplianceFlag.GDPR_RELATED
+        if "fda" in keyword_hits:
+            flags |= ComplianceFlag.FDA_RELATED
+        if "sox" in keyword_hits:
+            flags |= ComplianceFlag.SOX_COMPLIANCE
+        
+        # Check for sensitive information patterns, skipping the regexes
+        # when their required literals are absent
+        if self._DIGIT_RE.search(text):
+            if '-' in text and self._SSN_RE.search(text):  # SSN pattern
+                flags |= ComplianceFlag.CONTAINS_SSN
+            if self._CREDIT_CARD_RE.search(text):  # Credit card pattern
+                flags |= ComplianceFlag.CONTAINS_CREDIT_CARD
         
         # Check for urgency indicators
-        if re.search(r'urgent|asap|immediate|critical', text_lower):
-            flags.append("urgent_document")
+        if not self._URGENCY_TERMS.isdisjoint(keyword_hits):
+            flags |= ComplianceFlag.URGENT_DOCUMENT
         
         return flags
     
     def _extract_general_fields(self, text: str, document_type: str) -> Dict[str, Any]:
         """Extract general fields from document"""
         fields = {}
+        has_digit = self._DIGIT_RE.search(text) is not None
         
         # Extract dates
-        date_patterns = [
-            r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b',
-            r'\b(\d{4}-\d{2}-\d{2})\b'
-        ]
-        dates = []
-        for pattern in date_patterns:
-            dates.extend(re.findall(pattern, text))
-        if dates:
-            fields["dates_found"] = dates[:5]  # Limit to first 5
+        if has_digit:
+            # Stop scanning once the first 5 dates are found
+            dates = list(islice(
+                chain.from_iterable(
+                    (match.group(1) for match in regex.finditer(text)) for regex in self._DATE_RES
+                ),
+                5
+            ))
+            if dates:
+                fields["dates_found"] = dates
         
         # Extract amounts/numbers
-        amount_pattern = r'\$(\d+(?:,\d{3})*(?:\.\d{2})?)'
-        amounts = re.findall(amount_pattern, text)
-        if amounts:
-            fields["amounts_found"] = [float(amt.replace(',', '')) for amt in amounts[:10]]
+        if has_digit and '$' in text:
+            amounts = [match.group(1) for match in islice(self._AMOUNT_RE.finditer(text), 10)]  # Limit to first 10
+            if amounts:
+                fields["amounts_found"] = [float(amt.replace(',', '')) for amt in amounts]
         
         # Extract email addresses
-        email_pattern = r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            fields["emails_found"] = emails
+        if '@' in text:
+            emails = self._EMAIL_RE.findall(text)
+            if emails:
+                fields["emails_found"] = emails
         
         # Extract phone numbers
-        phone_pattern = r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b'
-        phones = re.findall(phone_pattern, text)
-        if phones:
-            fields["phones_found"] = phones
+        if has_digit:
+            phones = self._PHONE_RE.findall(text)
+            if phones:
+                fields["phones_found"] = phones
         
         # Document-specific extractions
         if document_type == "invoice":
             # Extract invoice number
-            for pattern in self.invoice_patterns["invoice_number"]:
-                match = re.search(pattern, text, re.IGNORECASE)
+            for regex in self._INVOICE_RES["invoice_number"]:
+                match = regex.search(text)
                 if match:
                     fields["invoice_number"] = match.group(1)
                     break
             
             # Extract vendor
-            for pattern in self.invoice_patterns["vendor"]:
-                match = re.search(pattern, text, re.IGNORECASE)
+            for regex in self._INVOICE_RES["vendor"]:
+                match = regex.search(text)
                 if match:
                     fields["vendor"] = match.group(1).strip()
                     break
         
         # Extract key-value pairs
-        kv_pattern = r'(\w+):\s*([^\n]+)'
-        key_values = re.findall(kv_pattern, text)
-        if key_values:
-            fields["key_value_pairs"] = dict(key_values[:10])  # Limit to first 10
+        if ':' in text:
+            key_values = [match.groups() for match in islice(self._KV_RE.finditer(text), 10)]  # Limit to first 10
+            if key_values:
+                fields["key_value_pairs"] = dict(key_values)
         
         return fields
     
-    def _recommend_actions(self, flags: List[str], total_amount: float, document_type: str) -> List[str]:
+    def _recommend_actions(self, flags: ComplianceFlag, total_amount: float, document_type: str) -> List[str]:
         """Recommend actions based on document analysis"""
         actions = []
         
         # High-value invoice actions
-        if "high_value_invoice" in flags:
+        if flags & ComplianceFlag.HIGH_VALUE_INVOICE:
             actions.append("require_manager_approval")
             actions.append("flag_financial_review")
         
         # Compliance document actions
-        if "compliance_document" in flags:
+        if flags & ComplianceFlag.COMPLIANCE_DOCUMENT:
             actions.append("route_to_compliance_team")
             actions.append("log_regulatory_document")
         
         # GDPR specific actions
-        if "gdpr_related" in flags:
+        if flags & ComplianceFlag.GDPR_RELATED:
             actions.append("notify_data_protection_officer")
             actions.append("ensure_gdpr_compliance")
         
         # FDA specific actions
-        if "fda_related" in flags:
+        if flags & ComplianceFlag.FDA_RELATED:
             actions.append("route_to_regulatory_affairs")
             actions.append("maintain_fda_audit_trail")
         
         # Sensitive information actions
-        if any(flag in flags for flag in ["contains_ssn", "contains_credit_card"]):
+        if flags & (ComplianceFlag.CONTAINS_SSN | ComplianceFlag.CONTAINS_CREDIT_CARD):
             actions.append("encrypt_and_secure")
             actions.append("limit_access_permissions")
         
         # Urgent document actions
-        if "urgent_document" in flags:
+        if flags & ComplianceFlag.URGENT_DOCUMENT:
             actions.append("prioritize_processing")
             actions.append("notify_relevant_teams")
         
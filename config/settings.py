@@ -6,6 +6,7 @@ class Settings(BaseSettings):
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
+    REDIS_MAX_CONNECTIONS: int = 64
     
     # API Configuration
     API_HOST: str = "0.0.0.0"
@@ -14,6 +15,7 @@ class Settings(BaseSettings):
     # External Services (Simulation)
     CRM_API_URL: str = "http://localhost:8001/crm"
     RISK_API_URL: str = "http://localhost:8001/risk"
+    SIMULATE_APIS: bool = True  # Return mock responses instead of calling the URLs above
     
     # LLM Configuration (Optional - for advanced classification)
     OPENAI_API_KEY: str = ""
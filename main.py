@@ -1,26 +1,70 @@
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 import uvicorn
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
-import json
+from typing import Dict, Any, Optional, Tuple
+import orjson
 import logging
+import re
 from datetime import datetime
 import asyncio
+from contextlib import asynccontextmanager
 
 from utils.pdf_parser import PDFParser
 from utils.validators import EmailValidator, InvoiceValidator, WebhookValidator
+from utils.executors import get_cpu_pool, start_cpu_pool, shutdown_cpu_pool
+from agents.base_agent import BaseAgent
+from routers.action_router import action_router
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Multi-Agent Document Processing System", version="1.0.0")
+# Non-empty lines, iterated without materialising a list of every line
+_LINE_RE = re.compile(r'[^\n]+')
+
+# Sentiment vocabulary, matched against the words of a lowercased text
+_WORD_RE = re.compile(r'[a-z]+')
+_POSITIVE_WORDS = frozenset({'good', 'great', 'excellent', 'happy', 'pleased', 'thanks', 'appreciate'})
+_NEGATIVE_WORDS = frozenset({'bad', 'terrible', 'awful', 'angry', 'frustrated', 'disappointed'})
+
+# Entity patterns for EmailAgent
+_ENTITY_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_ENTITY_PHONE_RE = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b')
+_ENTITY_DATE_RE = re.compile(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b')
+
+# Invoice field patterns for InvoiceAgent
+_INVOICE_NUMBER_RE = re.compile(r'Invoice[#\s]*:?\s*([A-Z0-9-]+)', re.IGNORECASE)
+_INVOICE_DATE_RE = re.compile(r'Date[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', re.IGNORECASE)
+_INVOICE_VENDOR_RE = re.compile(r'From[:\s]*([^\n]+)', re.IGNORECASE)
+_INVOICE_AMOUNT_RE = re.compile(r'\$[\d,]+\.?\d*')
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the worker pool; on shutdown flush agent decisions, close outbound HTTP and stop the pool"""
+    start_cpu_pool()
+    yield
+    await BaseAgent.close_decision_log()
+    await action_router.aclose()
+    # Let queued agent work finish without blocking the event loop
+    await asyncio.to_thread(shutdown_cpu_pool)
+
+# Responses encode with orjson unless a route says otherwise
+app = FastAPI(
+    title="Multi-Agent Document Processing System",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+# Main interface, read once at startup
+with open("static/index.html", "rb") as f:
+    _INDEX_HTML = f.read()
+
 # Initialize parsers and validators
 pdf_parser = PDFParser()
 email_validator = EmailValidator()
@@ -48,7 +92,9 @@ class EmailAgent:
     
     async def process(self, content: str) -> Dict[str, Any]:
         logger.info(f"{self.name} processing email content")
-        
+        return await asyncio.get_running_loop().run_in_executor(get_cpu_pool(), self._process_sync, content)
+    
+    def _process_sync(self, content: str) -> Dict[str, Any]:
         # Validate email format
         validation_result = email_validator.validate(content)
         if not validation_result["is_valid"]:
@@ -72,29 +118,32 @@ class EmailAgent:
         }
     
     def _extract_email_data(self, content: str) -> Dict[str, str]:
-        lines = content.strip().split('\n')
         email_data = {}
+        body_lines = []
         
-        for line in lines:
+        for line_match in _LINE_RE.finditer(content.strip()):
+            line = line_match.group()
             if line.startswith('From:'):
                 email_data['from'] = line.replace('From:', '').strip()
             elif line.startswith('To:'):
                 email_data['to'] = line.replace('To:', '').strip()
             elif line.startswith('Subject:'):
                 email_data['subject'] = line.replace('Subject:', '').strip()
-            elif not line.startswith(('From:', 'To:', 'Subject:')) and line.strip():
-                email_data['body'] = email_data.get('body', '') + line + '\n'
+            elif line.strip():
+                body_lines.append(line)
+        
+        # Join once instead of re-copying the body for every line
+        if body_lines:
+            email_data['body'] = '\n'.join(body_lines) + '\n'
         
         return email_data
     
     def _analyze_sentiment(self, text: str) -> Dict[str, Any]:
         # Simple sentiment analysis (in production, use proper NLP libraries)
-        positive_words = ['good', 'great', 'excellent', 'happy', 'pleased', 'thanks', 'appreciate']
-        negative_words = ['bad', 'terrible', 'awful', 'angry', 'frustrated', 'disappointed']
-        
-        text_lower = text.lower()
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
+        # Tokenize once; each sentiment word counts once if present as a whole word
+        words = set(_WORD_RE.findall(text.lower()))
+        positive_count = len(_POSITIVE_WORDS.intersection(words))
+        negative_count = len(_NEGATIVE_WORDS.intersection(words))
         
         if positive_count > negative_count:
             sentiment = "positive"
@@ -111,16 +160,15 @@ class EmailAgent:
     
     def _extract_entities(self, text: str) -> Dict[str, list]:
         # Simple entity extraction (in production, use NER models)
-        import re
         
         # Extract email addresses
-        emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+        emails = _ENTITY_EMAIL_RE.findall(text)
         
         # Extract phone numbers
-        phones = re.findall(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', text)
+        phones = _ENTITY_PHONE_RE.findall(text)
         
         # Extract dates
-        dates = re.findall(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b', text)
+        dates = _ENTITY_DATE_RE.findall(text)
         
         return {
             "emails": emails,
@@ -137,7 +185,9 @@ class InvoiceAgent:
     
     async def process(self, content: str) -> Dict[str, Any]:
         logger.info(f"{self.name} processing invoice content")
-        
+        return await asyncio.get_running_loop().run_in_executor(get_cpu_pool(), self._process_sync, content)
+    
+    def _process_sync(self, content: str) -> Dict[str, Any]:
         # Parse invoice data
         invoice_data = self._parse_invoice_data(content)
         
@@ -158,18 +208,16 @@ class InvoiceAgent:
         }
     
     def _parse_invoice_data(self, content: str) -> Dict[str, Any]:
-        import re
-        
         # Extract invoice number
-        invoice_match = re.search(r'Invoice[#\s]*:?\s*([A-Z0-9-]+)', content, re.IGNORECASE)
+        invoice_match = _INVOICE_NUMBER_RE.search(content)
         invoice_number = invoice_match.group(1) if invoice_match else None
         
         # Extract date
-        date_match = re.search(r'Date[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', content, re.IGNORECASE)
+        date_match = _INVOICE_DATE_RE.search(content)
         date = date_match.group(1) if date_match else None
         
         # Extract vendor information
-        vendor_match = re.search(r'From[:\s]*([^\n]+)', content, re.IGNORECASE)
+        vendor_match = _INVOICE_VENDOR_RE.search(content)
         vendor = vendor_match.group(1).strip() if vendor_match else None
         
         return {
@@ -179,10 +227,8 @@ class InvoiceAgent:
         }
     
     def _extract_financial_info(self, content: str) -> Dict[str, Any]:
-        import re
-        
         # Extract amounts (simple pattern matching)
-        amounts = re.findall(r'\$[\d,]+\.?\d*', content)
+        amounts = _INVOICE_AMOUNT_RE.findall(content)
         
         # Extract total (usually the last or largest amount)
         total = amounts[-1] if amounts else None
@@ -200,15 +246,18 @@ class WebhookAgent:
         self.name = "WebhookAgent"
         self.capabilities = ["webhook_validation", "payload_parsing", "event_classification"]
     
-    async def process(self, content: str) -> Dict[str, Any]:
+    async def process(self, content: str, payload: Optional[Any] = None) -> Dict[str, Any]:
         logger.info(f"{self.name} processing webhook content")
-        
+        return await asyncio.get_running_loop().run_in_executor(get_cpu_pool(), self._process_sync, content, payload)
+    
+    def _process_sync(self, content: str, payload: Optional[Any] = None) -> Dict[str, Any]:
         try:
-            # Parse JSON payload
-            payload = json.loads(content)
+            # Parse JSON payload unless routing already did
+            if payload is None:
+                payload = orjson.loads(content)
             
-            # Validate webhook
-            validation_result = webhook_validator.validate(payload)
+            # Validate webhook, sizing it by the body it was parsed from
+            validation_result = webhook_validator.validate(payload, raw=content)
             if not validation_result["is_valid"]:
                 raise ValueError(f"Invalid webhook: {validation_result['errors']}")
             
@@ -216,7 +265,7 @@ class WebhookAgent:
             event_classification = self._classify_event(payload)
             
             # Extract metadata
-            metadata = self._extract_metadata(payload)
+            metadata = self._extract_metadata(payload, content)
             
             return {
                 "payload": payload,
@@ -227,7 +276,7 @@ class WebhookAgent:
                 "confidence": 0.88
             }
         
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON payload: {str(e)}")
     
     def _classify_event(self, payload: Dict[str, Any]) -> Dict[str, str]:
@@ -250,12 +299,13 @@ class WebhookAgent:
             "category": category
         }
     
-    def _extract_metadata(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_metadata(self, payload: Dict[str, Any], content: str) -> Dict[str, Any]:
         return {
             "timestamp": payload.get('timestamp'),
             "version": payload.get('version'),
             "request_id": payload.get('id'),
-            "payload_size": len(str(payload))
+            # Byte size of the raw payload as received; ASCII text is one byte per character
+            "payload_size": len(content) if content.isascii() else len(content.encode())
         }
 
 class DocumentRouter:
@@ -270,45 +320,54 @@ class DocumentRouter:
     
     def route_document(self, content: str, document_type: str = None) -> str:
         """Determine which agent should process the document"""
+        return self._route(content, document_type)[0]
+    
+    def _route(self, content: str, document_type: str = None) -> Tuple[str, Optional[Any]]:
+        """Determine the agent, plus the parsed payload when routing detected JSON"""
         
         if document_type and document_type in self.agents:
-            return document_type
+            return document_type, None
         
         # Auto-detection logic
         content_lower = content.lower()
         
         # Check for email indicators
         if any(indicator in content_lower for indicator in ['from:', 'to:', 'subject:']):
-            return "email"
+            return "email", None
         
         # Check for invoice indicators
         if any(indicator in content_lower for indicator in ['invoice', 'bill', 'amount', '$']):
-            return "invoice"
+            return "invoice", None
         
-        # Check for webhook indicators (JSON structure)
-        try:
-            json.loads(content)
-            return "webhook"
-        except:
-            pass
+        # Check for webhook indicators (JSON structure); only parse text that
+        # can be an object or array, and keep the result for the agent
+        if content.lstrip()[:1] in ('{', '['):
+            try:
+                return "webhook", orjson.loads(content)
+            except orjson.JSONDecodeError:
+                pass
         
         # Default to email if uncertain
-        return "email"
+        return "email", None
     
     async def process_document(self, content: str, document_type: str = None) -> ProcessingResult:
         """Process document using appropriate agent"""
         
-        agent_type = self.route_document(content, document_type)
+        agent_type, payload = self._route(content, document_type)
         agent = self.agents[agent_type]
         
         try:
-            result = await agent.process(content)
+            if payload is not None:
+                result = await agent.process(content, payload)
+            else:
+                result = await agent.process(content)
             
             return ProcessingResult(
                 status="success",
                 agent_used=agent.name,
                 processed_data=result,
-                timestamp=datetime.now().isoformat(),
+                # Agents stamp their result as they finish; reuse it
+                timestamp=result.get("processing_time") or datetime.now().isoformat(),
                 confidence_score=result.get("confidence", 0.0)
             )
         
@@ -329,8 +388,7 @@ document_router = DocumentRouter()
 @app.get("/", response_class=HTMLResponse)
 async def get_index():
     """Serve the main interface"""
-    with open("static/index.html", "r") as f:
-        return f.read()
+    return HTMLResponse(content=_INDEX_HTML)
 
 @app.post("/process", response_model=ProcessingResult)
 async def process_document(request: DocumentRequest):
@@ -359,7 +417,7 @@ async def upload_file(file: UploadFile = File(...)):
     # Handle PDF files
     if file.filename.lower().endswith('.pdf'):
         try:
-            text_content = pdf_parser.extract_text(content)
+            text_content = await pdf_parser.extract_text_async(content)
             result = await document_router.process_document(
                 content=text_content,
                 document_type="invoice"  # Assume PDFs are invoices
@@ -396,4 +454,5 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
 if __name__ == "__main__":
+    # uvicorn runs on uvloop when it is installed (see requirements.txt)
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
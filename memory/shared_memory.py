@@ -1,19 +1,24 @@
-import json
+import orjson
 import redis
-from typing import Dict, List, Optional, Any
+from pydantic_core import to_json
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from models.schemas import MemoryEntry, ClassificationResult
 from config.settings import settings
 import uuid
 
+# Connections are shared across requests; replies stay as bytes, which orjson reads directly
+redis_pool = redis.ConnectionPool(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    db=settings.REDIS_DB,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    decode_responses=False
+)
+
 class SharedMemoryStore:
     def __init__(self):
-        self.redis_client = redis.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=settings.REDIS_DB,
-            decode_responses=True
-        )
+        self.redis_client = redis.Redis(connection_pool=redis_pool)
         
     def generate_id(self) -> str:
         """Generate unique ID for memory entries"""
@@ -22,19 +27,7 @@ class SharedMemoryStore:
     def store_entry(self, entry: MemoryEntry) -> str:
         """Store a memory entry"""
         try:
-            entry_dict = entry.model_dump(mode='json')
-            # Convert datetime to string for JSON serialization
-            if isinstance(entry_dict.get('timestamp'), datetime):
-                entry_dict['timestamp'] = entry_dict['timestamp'].isoformat()
-            
-            self.redis_client.hset(
-                f"memory:{entry.id}",
-                mapping={
-                    "data": json.dumps(entry_dict),
-                    "created_at": datetime.now().isoformat(),
-                    "status": entry.status
-                }
-            )
+            self._write_entry(entry)
             
             # Add to processing queue
             self.redis_client.lpush("processing_queue", entry.id)
@@ -44,16 +37,68 @@ class SharedMemoryStore:
             print(f"Error storing memory entry: {e}")
             raise
     
+    def _write_entry(self, entry: MemoryEntry) -> None:
+        """Write the full entry, folding in any separately appended outputs, trace and actions"""
+        pipe = self.redis_client.pipeline()
+        self._queue_entry_write(pipe, entry)
+        pipe.execute()
+    
+    def _queue_entry_write(self, pipe: Any, entry: MemoryEntry) -> None:
+        """Queue the writes that replace one entry and drop its appended copies"""
+        # Serialize straight to JSON in one pass (datetimes become ISO strings),
+        # leaving out fields still at their defaults, which are restored on read
+        data = entry.model_dump_json(exclude_defaults=True)
+        
+        pipe.hset(
+            f"memory:{entry.id}",
+            mapping={
+                "data": data,
+                "created_at": datetime.now().isoformat(),
+                "status": entry.status
+            }
+        )
+        # The written data already holds these, so drop the appended copies
+        pipe.delete(*self._appended_keys(entry.id))
+    
+    def _appended_keys(self, entry_id: str) -> Tuple[str, str, str]:
+        """Keys of the outputs, trace and actions appended to an entry since its last full write"""
+        return f"memory:{entry_id}:outputs", f"memory:{entry_id}:trace", f"memory:{entry_id}:actions"
+    
+    def _queue_entry_reads(self, pipe: Any, entry_id: str) -> None:
+        """Queue the reads needed to rebuild one entry"""
+        pipe.hget(f"memory:{entry_id}", "data")
+        pipe.hgetall(f"memory:{entry_id}:outputs")
+        pipe.lrange(f"memory:{entry_id}:trace", 0, -1)
+        pipe.lrange(f"memory:{entry_id}:actions", 0, -1)
+    
     def get_entry(self, entry_id: str) -> Optional[MemoryEntry]:
         """Retrieve a memory entry"""
         try:
-            data = self.redis_client.hget(f"memory:{entry_id}", "data")
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_entry_reads(pipe, entry_id)
+            data, outputs, trace, actions = pipe.execute()
+        except Exception as e:
+            print(f"Error retrieving memory entry: {e}")
+            return None
+        return self._parse_entry(data, outputs, trace, actions)
+    
+    def _parse_entry(self, data: Optional[bytes], outputs: Optional[Dict[bytes, bytes]] = None,
+                     trace: Optional[List[bytes]] = None, actions: Optional[List[bytes]] = None) -> Optional[MemoryEntry]:
+        """Build a memory entry from its stored JSON and appended structures"""
+        try:
             if data:
-                entry_dict = json.loads(data)
-                # Convert string timestamp back to datetime
-                if 'timestamp' in entry_dict:
-                    entry_dict['timestamp'] = datetime.fromisoformat(entry_dict['timestamp'])
-                return MemoryEntry(**entry_dict)
+                # Parse and validate straight from the JSON bytes in one pass
+                entry = MemoryEntry.model_validate_json(data)
+                
+                # Merge outputs, trace and actions appended since the last full write
+                for agent_name, output in (outputs or {}).items():
+                    entry.agent_outputs[agent_name.decode()] = orjson.loads(output)
+                if trace:
+                    entry.decision_trace.extend(item.decode() for item in trace)
+                if actions:
+                    entry.actions_triggered.extend(item.decode() for item in actions)
+                
+                return entry
             return None
         except Exception as e:
             print(f"Error retrieving memory entry: {e}")
@@ -62,46 +107,66 @@ class SharedMemoryStore:
     def update_entry(self, entry_id: str, updates: Dict[str, Any]) -> bool:
         """Update specific fields of a memory entry"""
         try:
-            entry = self.get_entry(entry_id)
-            if not entry:
+            with self.redis_client.pipeline() as pipe:
+                while True:
+                    # An output or action appended after the read would be folded
+                    # away unseen by the write, so retry when any of the keys change
+                    pipe.watch(f"memory:{entry_id}", *self._appended_keys(entry_id))
+                    entry = self.get_entry(entry_id)
+                    if not entry:
+                        return False
+                    
+                    # Copy with only the updated fields replaced, skipping revalidation
+                    pipe.multi()
+                    self._queue_entry_write(pipe, entry.model_copy(update=updates))
+                    try:
+                        pipe.execute()
+                        return True
+                    except redis.WatchError:
+                        continue
+        except Exception as e:
+            print(f"Error updating memory entry: {e}")
+            return False
+    
+    def add_agent_output(self, entry_id: str, agent_name: str, output: Dict[str, Any]) -> bool:
+        """Add agent output to memory entry"""
+        try:
+            if not self.redis_client.exists(f"memory:{entry_id}"):
                 return False
             
-            # Update the entry
-            entry_dict = entry.model_dump()
-            entry_dict.update(updates)
+            # Trace with the output's own timestamp when it carries one
+            logged_at = output.get("timestamp") or datetime.now().isoformat()
             
-            updated_entry = MemoryEntry(**entry_dict)
-            self.store_entry(updated_entry)
+            # Append without reading or rewriting the stored entry
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hset(f"memory:{entry_id}:outputs", agent_name, to_json(output))
+            pipe.rpush(f"memory:{entry_id}:trace", f"{agent_name}: {logged_at}")
+            pipe.execute()
             return True
         except Exception as e:
             print(f"Error updating memory entry: {e}")
             return False
     
-    def add_agent_output(self, entry_id: str, agent_name: str, output: Dict[str, Any]) -> bool:
-        """Add agent output to memory entry"""
-        entry = self.get_entry(entry_id)
-        if entry:
-            entry.agent_outputs[agent_name] = output
-            entry.decision_trace.append(f"{agent_name}: {datetime.now().isoformat()}")
-            return self.update_entry(entry_id, {
-                "agent_outputs": entry.agent_outputs,
-                "decision_trace": entry.decision_trace
-            })
-        return False
-    
     def add_action_triggered(self, entry_id: str, action: str) -> bool:
         """Add triggered action to memory entry"""
-        entry = self.get_entry(entry_id)
-        if entry:
-            entry.actions_triggered.append(action)
-            return self.update_entry(entry_id, {
-                "actions_triggered": entry.actions_triggered
-            })
-        return False
+        return self.add_actions_triggered(entry_id, [action])
+    
+    def add_actions_triggered(self, entry_id: str, actions: List[str]) -> bool:
+        """Add several triggered actions to memory entry in one write"""
+        try:
+            if not self.redis_client.exists(f"memory:{entry_id}"):
+                return False
+            
+            if actions:
+                self.redis_client.rpush(f"memory:{entry_id}:actions", *actions)
+            return True
+        except Exception as e:
+            print(f"Error updating memory entry: {e}")
+            return False
     
     def get_processing_queue(self) -> List[str]:
         """Get list of entries in processing queue"""
-        return self.redis_client.lrange("processing_queue", 0, -1)
+        return [entry_id.decode() for entry_id in self.redis_client.lrange("processing_queue", 0, -1)]
     
     def remove_from_queue(self, entry_id: str) -> bool:
         """Remove entry from processing queue"""
@@ -109,11 +174,21 @@ class SharedMemoryStore:
     
     def get_all_entries(self) -> List[MemoryEntry]:
         """Get all memory entries"""
-        keys = self.redis_client.keys("memory:*")
+        # SCAN instead of KEYS so Redis is not blocked, then one round-trip for all reads.
+        # Keys with a suffix (memory:{id}:outputs etc.) belong to an entry and are skipped
+        entry_ids = [
+            key.split(b":")[1].decode()
+            for key in self.redis_client.scan_iter(match="memory:*", count=500)
+            if key.count(b":") == 1
+        ]
+        pipe = self.redis_client.pipeline(transaction=False)
+        for entry_id in entry_ids:
+            self._queue_entry_reads(pipe, entry_id)
+        results = pipe.execute()
+        
         entries = []
-        for key in keys:
-            entry_id = key.split(":")[1]
-            entry = self.get_entry(entry_id)
+        for i in range(0, len(results), 4):
+            entry = self._parse_entry(*results[i:i + 4])
             if entry:
                 entries.append(entry)
         return entries
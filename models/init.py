@@ -1,7 +1,7 @@
 from .schemas import *
 
 __all__ = [
-    "FormatType", "BusinessIntent", "Urgency", "Tone",
+    "FormatType", "BusinessIntent", "Urgency", "Tone", "ComplianceFlag",
     "ClassificationResult", "EmailData", "JSONData", "PDFData",
     "ProcessingResult", "ActionRequest", "MemoryEntry"
 ]
\ No newline at end of file
@@ -1,7 +1,7 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, Dict, List, Any, Literal
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Dict, List, Any, Literal, Tuple
 from datetime import datetime
-from enum import Enum
+from enum import Enum, IntFlag
 
 class FormatType(str, Enum):
     EMAIL = "email"
@@ -29,46 +29,82 @@ class Tone(str, Enum):
     THREATENING = "threatening"
     ANGRY = "angry"
 
+class ComplianceFlag(IntFlag):
+    """PDF risk flags in report order; the lowercased member name is the reported flag"""
+    HIGH_VALUE_INVOICE = 1 << 0
+    COMPLIANCE_DOCUMENT = 1 << 1
+    CONTAINS_GDPR = 1 << 2
+    CONTAINS_FDA = 1 << 3
+    CONTAINS_SOX = 1 << 4
+    CONTAINS_HIPAA = 1 << 5
+    CONTAINS_PCI = 1 << 6
+    CONTAINS_COMPLIANCE = 1 << 7
+    CONTAINS_REGULATION = 1 << 8
+    CONTAINS_POLICY = 1 << 9
+    CONTAINS_AUDIT = 1 << 10
+    CONTAINS_SECURITY = 1 << 11
+    GDPR_RELATED = 1 << 12
+    FDA_RELATED = 1 << 13
+    SOX_COMPLIANCE = 1 << 14
+    CONTAINS_SSN = 1 << 15
+    CONTAINS_CREDIT_CARD = 1 << 16
+    URGENT_DOCUMENT = 1 << 17
+
+# Immutable models whose validators are built on first use
+_MODEL_CONFIG = ConfigDict(frozen=True, defer_build=True, extra="ignore")
+
 class ClassificationResult(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     format_type: FormatType
     business_intent: BusinessIntent
     confidence_score: float = Field(ge=0, le=1)
-    metadata: Dict[str, Any] = {}
+    metadata: Dict[str, Any] = Field(default_factory=dict)
 
 class EmailData(BaseModel):
-    sender: EmailStr
+    model_config = _MODEL_CONFIG
+    
+    sender: str  # Checked where email text enters the system, not per instance
     subject: str
     body: str
     urgency: Urgency
     tone: Tone
     timestamp: datetime
-    extracted_fields: Dict[str, Any] = {}
+    extracted_fields: Dict[str, Any] = Field(default_factory=dict)
 
 class JSONData(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     webhook_type: str
     payload: Dict[str, Any]
     schema_valid: bool
-    anomalies: List[str] = []
-    extracted_fields: Dict[str, Any] = {}
+    anomalies: Tuple[str, ...] = ()
+    extracted_fields: Dict[str, Any] = Field(default_factory=dict)
 
 class PDFData(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     document_type: str
     extracted_text: str
-    line_items: List[Dict[str, Any]] = []
+    line_items: Tuple[Dict[str, Any], ...] = ()
     total_amount: Optional[float] = None
-    flags: List[str] = []
-    extracted_fields: Dict[str, Any] = {}
+    flags: Tuple[str, ...] = ()
+    extracted_fields: Dict[str, Any] = Field(default_factory=dict)
 
 class ProcessingResult(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     input_id: str
     classification: ClassificationResult
     agent_output: Dict[str, Any]
-    actions_triggered: List[str] = []
+    actions_triggered: Tuple[str, ...] = ()
     timestamp: datetime
     status: Literal["success", "error", "pending"]
     error_message: Optional[str] = None
 
 class ActionRequest(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     action_type: str
     payload: Dict[str, Any]
     source_agent: str
@@ -76,11 +112,18 @@ class ActionRequest(BaseModel):
     priority: Urgency = Urgency.MEDIUM
 
 class MemoryEntry(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     id: str
     input_metadata: Dict[str, Any]
     classification: ClassificationResult
-    agent_outputs: Dict[str, Any] = {}
-    actions_triggered: List[str] = []
-    decision_trace: List[str] = []
+    agent_outputs: Dict[str, Any] = Field(default_factory=dict)
+    actions_triggered: List[str] = Field(default_factory=list)
+    decision_trace: List[str] = Field(default_factory=list)
     timestamp: datetime
-    status: str = "processing"
\ No newline at end of file
+    status: str = "processing"
+
+# Build the models used on every request now rather than on first use
+ClassificationResult.model_rebuild()
+ProcessingResult.model_rebuild()
+MemoryEntry.model_rebuild()
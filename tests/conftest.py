@@ -0,0 +1,18 @@
+"""
+Shared pytest fixtures.
+"""
+
+import pytest
+
+from memory.shared_memory import memory_store
+
+
+@pytest.fixture
+def written(monkeypatch):
+    """Record agent outputs sent to memory_store as (entry_id, agent_name, output), without Redis."""
+    outputs = []
+    monkeypatch.setattr(
+        memory_store, "add_agent_output",
+        lambda entry_id, agent_name, output: outputs.append((entry_id, agent_name, output)) or True
+    )
+    return outputs
@@ -0,0 +1,52 @@
+"""
+Test module for the agents' background decision log.
+
+memory_store.add_agent_output is replaced with the conftest recorder, so the
+tests check what reaches the memory store without a running Redis server.
+"""
+
+import pytest
+
+from agents.base_agent import BaseAgent
+
+
+class RecordingAgent(BaseAgent):
+    """Minimal concrete agent for exercising BaseAgent."""
+    
+    async def process(self, input_data, classification, entry_id):
+        self.log_decision(entry_id, f"processed {input_data}")
+        return {"agent": self.name}
+
+
+async def test_flush_decisions_writes_logged_decisions(written):
+    agent = RecordingAgent("RecordingAgent")
+
+    agent.log_decision("entry-1", "first")
+    agent.log_decision("entry-2", "second")
+    await BaseAgent.flush_decisions()
+
+    assert [(entry_id, name, output["decision"]) for entry_id, name, output in written] == [
+        ("entry-1", "RecordingAgent", "first"),
+        ("entry-2", "RecordingAgent", "second")
+    ]
+    assert all(output["agent_id"] == agent.agent_id for _, _, output in written)
+    await BaseAgent.close_decision_log()
+
+
+async def test_close_decision_log_writes_pending_and_stops_consumer(written):
+    agent = RecordingAgent("RecordingAgent")
+
+    for i in range(100):
+        await agent.process(i, None, f"entry-{i}")
+    task = BaseAgent._log_task
+    await BaseAgent.close_decision_log()
+
+    assert [entry_id for entry_id, _, _ in written] == [f"entry-{i}" for i in range(100)]
+    assert task.done()
+    assert BaseAgent._log_task is None
+
+
+def test_log_decision_writes_through_without_event_loop(written):
+    RecordingAgent("RecordingAgent").log_decision("entry-1", "sync")
+
+    assert [(entry_id, output["decision"]) for entry_id, _, output in written] == [("entry-1", "sync")]
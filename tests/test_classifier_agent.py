@@ -0,0 +1,51 @@
+"""
+Test module for ClassifierAgent batch classification.
+
+process_batch must classify each input exactly as process does, keep input
+order, and log a decision only for inputs that have an entry id.
+"""
+
+import pytest
+
+from agents.base_agent import BaseAgent
+from agents.classifier_agent import ClassifierAgent
+
+
+_INPUTS = [
+    "From: alice@example.com\nTo: bob@example.com\nSubject: Invoice overdue\n\nDear Bob, please pay invoice INV-1 asap.",
+    '{"type": "order.created", "data": {"id": 7}, "webhook": true}',
+    "%PDF-1.4 Invoice #123 Total: $1,200.00 Amount due 12/01/2024",
+    "GDPR compliance audit report for the regulation review",
+    "I am very unhappy with this product and want a refund",
+    ""
+]
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return ClassifierAgent()
+
+
+async def test_process_batch_matches_process_in_input_order(classifier):
+    expected = [await classifier.process(input_data) for input_data in _INPUTS]
+
+    results = await classifier.process_batch(_INPUTS)
+
+    assert [result.model_dump() for result in results] == [result.model_dump() for result in expected]
+
+
+async def test_process_batch_of_nothing_is_empty(classifier):
+    assert await classifier.process_batch([]) == []
+
+
+async def test_process_batch_logs_decisions_for_entry_ids(classifier, written):
+    entry_ids = ["entry-0", None, "entry-2"]
+
+    results = await classifier.process_batch(_INPUTS[:3], entry_ids)
+    await BaseAgent.close_decision_log()
+
+    assert [(entry_id, output["decision"]) for entry_id, _, output in written] == [
+        (entry_id, f"Classified as {result.format_type.value} with intent {result.business_intent.value}")
+        for entry_id, result in zip(entry_ids, results)
+        if entry_id
+    ]
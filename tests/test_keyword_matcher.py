@@ -0,0 +1,78 @@
+"""
+Test module for KeywordMatcher.
+
+find() must report exactly the keywords for which ``keyword in text`` holds,
+including keywords that overlap, share a prefix or contain one another.
+"""
+
+import random
+
+import pytest
+
+from agents.classifier_agent import ClassifierAgent
+from agents.email_agent import EmailAgent
+from utils.keyword_matcher import KeywordMatcher
+from utils.validators import _SPAM_MATCHER
+
+
+# Keywords that overlap in every way the alternation has to handle
+_OVERLAPPING = [
+    "low priority", "priority", "high priority",
+    "please", "please help", "help", "lease", "ease",
+    "urgent", "urgently", "gent",
+    "act now", "now", "know",
+    "asap", "a"
+]
+
+
+def _expected(keywords, text_lower):
+    return {keyword.lower() for keyword in keywords if keyword.lower() in text_lower}
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "nothing to see",
+    "low priority",
+    "this is low priority, not high priority",
+    "please help me",
+    "pleased to know you",
+    "urgently needed, act now asap",
+    "priority" * 3,
+    "lowpriority",
+    "pleaseplease help"
+])
+def test_find_matches_substring_check_on_overlapping_keywords(text):
+    matcher = KeywordMatcher(_OVERLAPPING)
+
+    assert matcher.find(text) == _expected(_OVERLAPPING, text)
+
+
+def test_find_matches_substring_check_on_agent_keyword_lists():
+    email_agent = EmailAgent()
+    classifier = ClassifierAgent()
+    keyword_lists = [
+        [keyword for keywords in email_agent.urgency_keywords.values() for keyword in keywords],
+        [keyword for keywords in email_agent.tone_keywords.values() for keyword in keywords],
+        [keyword for keywords in classifier.intent_keywords.values() for keyword in keywords],
+        _SPAM_MATCHER.keywords
+    ]
+
+    rng = random.Random(0)
+    for keywords in keyword_lists:
+        matcher = KeywordMatcher(keywords)
+        # Texts stitched from keyword fragments, so matches overlap and abut
+        fragments = [keyword[:cut] for keyword in matcher.keywords for cut in (None, 2, -2)] + [" ", ", "]
+        for _ in range(500):
+            text = "".join(rng.choice(fragments) for _ in range(rng.randint(0, 12)))
+            assert matcher.find(text) == _expected(keywords, text), text
+
+
+def test_keywords_are_lowercased_and_deduplicated():
+    matcher = KeywordMatcher(["Urgent", "urgent", "ASAP", "Please"])
+
+    assert matcher.keywords == ["urgent", "asap", "please"]
+    assert matcher.find("urgent: please reply asap") == {"urgent", "asap", "please"}
+
+
+def test_empty_matcher_finds_nothing():
+    assert KeywordMatcher([]).find("anything at all") == set()
@@ -0,0 +1,77 @@
+"""
+Test module for the PDF parser batch worker.
+
+Batches run on a thread pool with the worker entry point patched, so the
+tests exercise the queueing and future handling without parsing real PDFs.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils import pdf_parser
+from utils.pdf_parser import PDFParserBatchWorker
+
+
+@pytest.fixture
+def executor():
+    pool = ThreadPoolExecutor(max_workers=2)
+    yield pool
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def test_batch_worker_returns_results_in_request_order(executor, monkeypatch):
+    monkeypatch.setattr(pdf_parser, "_extract_structured_data", lambda content: {"content": content})
+    worker = PDFParserBatchWorker(executor=executor, batch_size=2)
+
+    contents = [f"pdf-{i}".encode() for i in range(5)]
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(*(worker.extract_structured_data(content) for content in contents)),
+            timeout=5
+        )
+    finally:
+        worker.close()
+
+    assert results == [{"content": content} for content in contents]
+
+
+async def test_batch_worker_close_cancels_in_flight_and_queued_requests(executor, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_extract(content):
+        started.set()
+        release.wait(5)
+        return {"content": content}
+
+    monkeypatch.setattr(pdf_parser, "_extract_structured_data", blocking_extract)
+    worker = PDFParserBatchWorker(executor=executor, batch_size=1)
+
+    try:
+        in_flight = asyncio.ensure_future(worker.extract_structured_data(b"first"))
+        await asyncio.to_thread(started.wait, 5)
+        queued = [asyncio.ensure_future(worker.extract_structured_data(f"next-{i}".encode())) for i in range(3)]
+        await asyncio.sleep(0)
+
+        worker.close()
+        results = await asyncio.wait_for(asyncio.gather(in_flight, *queued, return_exceptions=True), timeout=5)
+    finally:
+        release.set()
+
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+
+async def test_batch_worker_restarts_after_close(executor, monkeypatch):
+    monkeypatch.setattr(pdf_parser, "_extract_structured_data", lambda content: {"content": content})
+    worker = PDFParserBatchWorker(executor=executor)
+
+    worker.close()
+    try:
+        result = await asyncio.wait_for(worker.extract_structured_data(b"again"), timeout=5)
+    finally:
+        worker.close()
+
+    assert result == {"content": b"again"}
@@ -8,14 +8,24 @@ This module contains unit tests for all router classes including:
 - HealthCheckRouter
 """
 
-import unittest
+import asyncio
+import itertools
+import time
+from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, patch, MagicMock
 import pytest
-import json
 import io
 from pathlib import Path
 import tempfile
+import shutil
 import os
+from types import MappingProxyType
+
+# orjson parses the bytes directly; json.loads also accepts bytes
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 # Import test configuration
 from . import TestConfig, get_test_data_path, ensure_test_data_exists
@@ -32,7 +42,7 @@ class MockFastAPIRequest:
     
     async def json(self):
         """Mock JSON method."""
-        return json.loads(self.body.decode()) if self.body else {}
+        return json_loads(self.body) if self.body else {}
     
     async def form(self):
         """Mock form data method."""
@@ -42,15 +52,15 @@ class MockFastAPIRequest:
 class MockUploadFile:
     """Mock file upload object."""
     
-    def __init__(self, filename="test.pdf", content=b"fake pdf content"):
+    def __init__(self, filename="test.pdf", content=b"%PDF-1.4 fake pdf content"):
         self.filename = filename
         self.content_type = "application/pdf"
         self.file = io.BytesIO(content)
         self.size = len(content)
     
-    async def read(self):
-        """Read file content."""
-        return self.file.getvalue()
+    async def read(self, size=-1):
+        """Read file content from the current position, like UploadFile.read."""
+        return self.file.read(size)
     
     def seek(self, position):
         """Seek to position in file."""
@@ -63,6 +73,8 @@ class MockInvoiceUploadRouter:
     def __init__(self):
         self.uploaded_files = []
         self.processing_queue = []
+        # Upload content by file ID, spooled for the PDF parser
+        self.spooled_files = {}
     
     async def upload_invoice(self, file: MockUploadFile):
         """Mock invoice upload endpoint."""
@@ -73,17 +85,30 @@ class MockInvoiceUploadRouter:
                 "code": 400
             }
         
-        # Simulate file validation
-        content = await file.read()
-        if len(content) == 0:
+        # Validate from the first bytes only, without buffering the whole upload
+        head = await file.read(8)
+        if len(head) == 0:
             return {
                 "status": "error",
                 "message": "Empty file uploaded",
                 "code": 400
             }
+        if not head.startswith(b"%PDF-"):
+            return {
+                "status": "error",
+                "message": "File is not a valid PDF",
+                "code": 400
+            }
+        
+        # Spill the rest to a spooled file, which PDFParser reads in place
+        spool = tempfile.SpooledTemporaryFile(max_size=8 << 20)
+        spool.write(head)
+        shutil.copyfileobj(file.file, spool)
+        spool.seek(0)
         
         # Mock successful upload
         file_id = f"upload_{len(self.uploaded_files) + 1}"
+        self.spooled_files[file_id] = spool
         self.uploaded_files.append({
             "id": file_id,
             "filename": file.filename,
@@ -121,22 +146,27 @@ class MockProcessingRouter:
     """Mock router for invoice processing endpoints."""
     
     def __init__(self):
-        self.processing_jobs = {}
-        self.job_counter = 0
+        # One column per job field, keyed by job ID; status polls touch only
+        # status and progress, and job_details is assembled per response
+        self.job_file = {}
+        self.job_status = {}
+        self.job_progress = {}
+        self.job_started = {}
+        self.job_estimated = {}
+        self._job_ids = itertools.count(1)
+        # (epoch second, started_at, estimated_completion), reformatted when the second ticks
+        self._timestamps = (None, None, None)
     
     async def start_processing(self, file_id: str):
         """Start invoice processing."""
-        self.job_counter += 1
-        job_id = f"job_{self.job_counter}"
+        job_id = f"job_{next(self._job_ids)}"
+        _, started_at, estimated_completion = self._current_timestamps()
         
-        self.processing_jobs[job_id] = {
-            "job_id": job_id,
-            "file_id": file_id,
-            "status": "processing",
-            "progress": 0,
-            "started_at": "2024-05-30T10:00:00Z",
-            "estimated_completion": "2024-05-30T10:02:00Z"
-        }
+        self.job_file[job_id] = file_id
+        self.job_status[job_id] = "processing"
+        self.job_progress[job_id] = 0
+        self.job_started[job_id] = started_at
+        self.job_estimated[job_id] = estimated_completion
         
         return {
             "status": "success",
@@ -145,38 +175,58 @@ class MockProcessingRouter:
             "estimated_time": "2 minutes"
         }
     
+    def _current_timestamps(self):
+        """Return the cached start/estimate timestamps, refreshed once per second."""
+        second = int(time.time())
+        if self._timestamps[0] != second:
+            started = datetime.fromtimestamp(second, timezone.utc)
+            self._timestamps = (
+                second,
+                started.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                (started + timedelta(minutes=2)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            )
+        return self._timestamps
+    
     async def get_processing_status(self, job_id: str):
         """Get processing status."""
-        if job_id not in self.processing_jobs:
+        status = self.job_status.get(job_id)
+        if status is None:
             return {
                 "status": "error",
                 "message": "Job not found",
                 "code": 404
             }
         
-        job = self.processing_jobs[job_id]
+        progress = self.job_progress[job_id]
         
         # Simulate progress
-        if job["status"] == "processing":
-            job["progress"] = min(job["progress"] + 10, 100)
-            if job["progress"] >= 100:
-                job["status"] = "completed"
+        if status == "processing":
+            progress = self.job_progress[job_id] = min(progress + 10, 100)
+            if progress >= 100:
+                status = self.job_status[job_id] = "completed"
         
         return {
             "status": "success",
-            "job_details": job
+            "job_details": {
+                "job_id": job_id,
+                "file_id": self.job_file[job_id],
+                "status": status,
+                "progress": progress,
+                "started_at": self.job_started[job_id],
+                "estimated_completion": self.job_estimated[job_id]
+            }
         }
     
     async def cancel_processing(self, job_id: str):
         """Cancel processing job."""
-        if job_id not in self.processing_jobs:
+        if job_id not in self.job_status:
             return {
                 "status": "error",
                 "message": "Job not found",
                 "code": 404
             }
         
-        self.processing_jobs[job_id]["status"] = "cancelled"
+        self.job_status[job_id] = "cancelled"
         
         return {
             "status": "success",
@@ -188,16 +238,21 @@ class MockProcessingRouter:
 class MockResultsRouter:
     """Mock router for results endpoints."""
     
+    # Read-only view of the sample results every new job starts from
+    _RESULTS_TEMPLATE = MappingProxyType(TestConfig.SAMPLE_INVOICE_DATA)
+    
     def __init__(self):
         self.results_store = {}
     
     async def get_extraction_results(self, job_id: str):
         """Get extraction results for a job."""
         if job_id not in self.results_store:
-            # Generate mock results
-            self.results_store[job_id] = TestConfig.SAMPLE_INVOICE_DATA.copy()
-            self.results_store[job_id]["job_id"] = job_id
-            self.results_store[job_id]["extraction_confidence"] = 0.95
+            # Generate mock results in a single dict build
+            self.results_store[job_id] = {
+                **self._RESULTS_TEMPLATE,
+                "job_id": job_id,
+                "extraction_confidence": 0.95
+            }
         
         return {
             "status": "success",
@@ -275,278 +330,282 @@ class MockHealthCheckRouter:
         }
 
 
-class TestInvoiceUploadRouter(unittest.TestCase):
-    """Test cases for InvoiceUploadRouter."""
-    
-    def setUp(self):
-        """Set up test fixtures."""
-        self.router = MockInvoiceUploadRouter()
+# Async tests run under pytest-asyncio (asyncio_mode = auto in pytest.ini),
+# all on this one loop instead of a new loop per test
+@pytest.fixture(scope="session")
+def event_loop():
+    """Event loop shared by every async test in the session."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+# The mock routers keep per-test state, and each is cheap to build,
+# so every test gets a fresh instance
+@pytest.fixture
+def upload_router():
+    """Fresh invoice upload router."""
+    return MockInvoiceUploadRouter()
+
+
+@pytest.fixture
+def processing_router():
+    """Fresh processing router."""
+    return MockProcessingRouter()
+
+
+@pytest.fixture
+def results_router():
+    """Fresh results router."""
+    return MockResultsRouter()
+
+
+@pytest.fixture
+def health_router():
+    """Fresh health check router."""
+    return MockHealthCheckRouter()
+
+
+# InvoiceUploadRouter tests
+async def test_successful_upload(upload_router):
+    """Test successful PDF upload."""
+    mock_file = MockUploadFile("test_invoice.pdf", b"%PDF-1.4 fake pdf content")
+    result = await upload_router.upload_invoice(mock_file)
+    
+    assert result["status"] == "success"
+    assert "file_id" in result
+    assert result["filename"] == "test_invoice.pdf"
+
+
+async def test_invalid_file_type(upload_router):
+    """Test upload with invalid file type."""
+    mock_file = MockUploadFile("test_invoice.txt", b"text content")
+    result = await upload_router.upload_invoice(mock_file)
+    
+    assert result["status"] == "error"
+    assert result["code"] == 400
+    assert "Only PDF files are allowed" in result["message"]
+
+
+async def test_empty_file_upload(upload_router):
+    """Test upload with empty file."""
+    mock_file = MockUploadFile("empty.pdf", b"")
+    result = await upload_router.upload_invoice(mock_file)
+    
+    assert result["status"] == "error"
+    assert result["code"] == 400
+    assert "Empty file" in result["message"]
+
+
+async def test_non_pdf_content_upload(upload_router):
+    """Test upload of a .pdf file without the PDF magic bytes."""
+    mock_file = MockUploadFile("fake.pdf", b"not a pdf")
+    result = await upload_router.upload_invoice(mock_file)
+    
+    assert result["status"] == "error"
+    assert result["code"] == 400
+    assert "not a valid PDF" in result["message"]
+
+
+async def test_get_upload_status_existing(upload_router):
+    """Test getting status of existing upload."""
+    # First upload a file
+    mock_file = MockUploadFile("test.pdf", b"%PDF-1.4 content")
+    upload_result = await upload_router.upload_invoice(mock_file)
+    file_id = upload_result["file_id"]
+    
+    # Then check status
+    status_result = await upload_router.get_upload_status(file_id)
+    
+    assert status_result["status"] == "success"
+    assert status_result["file_id"] == file_id
+    assert status_result["upload_status"] == "completed"
+
+
+async def test_get_upload_status_nonexistent(upload_router):
+    """Test getting status of non-existent upload."""
+    result = await upload_router.get_upload_status("nonexistent_id")
     
-    async def test_successful_upload(self):
-        """Test successful PDF upload."""
-        mock_file = MockUploadFile("test_invoice.pdf", b"fake pdf content")
-        result = await self.router.upload_invoice(mock_file)
-        
-        self.assertEqual(result["status"], "success")
-        self.assertIn("file_id", result)
-        self.assertEqual(result["filename"], "test_invoice.pdf")
-    
-    async def test_invalid_file_type(self):
-        """Test upload with invalid file type."""
-        mock_file = MockUploadFile("test_invoice.txt", b"text content")
-        result = await self.router.upload_invoice(mock_file)
-        
-        self.assertEqual(result["status"], "error")
-        self.assertEqual(result["code"], 400)
-        self.assertIn("Only PDF files are allowed", result["message"])
-    
-    async def test_empty_file_upload(self):
-        """Test upload with empty file."""
-        mock_file = MockUploadFile("empty.pdf", b"")
-        result = await self.router.upload_invoice(mock_file)
-        
-        self.assertEqual(result["status"], "error")
-        self.assertEqual(result["code"], 400)
-        self.assertIn("Empty file", result["message"])
-    
-    async def test_get_upload_status_existing(self):
-        """Test getting status of existing upload."""
-        # First upload a file
-        mock_file = MockUploadFile("test.pdf", b"content")
-        upload_result = await self.router.upload_invoice(mock_file)
-        file_id = upload_result["file_id"]
-        
-        # Then check status
-        status_result = await self.router.get_upload_status(file_id)
-        
-        self.assertEqual(status_result["status"], "success")
-        self.assertEqual(status_result["file_id"], file_id)
-        self.assertEqual(status_result["upload_status"], "completed")
+    assert result["status"] == "error"
+    assert result["code"] == 404
+
+
+# ProcessingRouter tests
+async def test_start_processing(processing_router):
+    """Test starting processing job."""
+    result = await processing_router.start_processing("file_123")
+    
+    assert result["status"] == "success"
+    assert "job_id" in result
+    assert "estimated_time" in result
+
+
+async def test_get_processing_status_existing(processing_router):
+    """Test getting status of existing job."""
+    # Start a job first
+    start_result = await processing_router.start_processing("file_123")
+    job_id = start_result["job_id"]
+    
+    # Check status
+    status_result = await processing_router.get_processing_status(job_id)
+    
+    assert status_result["status"] == "success"
+    assert "job_details" in status_result
+    assert status_result["job_details"]["job_id"] == job_id
+
+
+async def test_get_processing_status_nonexistent(processing_router):
+    """Test getting status of non-existent job."""
+    result = await processing_router.get_processing_status("nonexistent_job")
     
-    async def test_get_upload_status_nonexistent(self):
-        """Test getting status of non-existent upload."""
-        result = await self.router.get_upload_status("nonexistent_id")
-        
-        self.assertEqual(result["status"], "error")
-        self.assertEqual(result["code"], 404)
+    assert result["status"] == "error"
+    assert result["code"] == 404
 
 
-class TestProcessingRouter(unittest.TestCase):
-    """Test cases for ProcessingRouter."""
+async def test_cancel_processing_existing(processing_router):
+    """Test cancelling existing job."""
+    # Start a job first
+    start_result = await processing_router.start_processing("file_123")
+    job_id = start_result["job_id"]
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.router = MockProcessingRouter()
+    # Cancel the job
+    cancel_result = await processing_router.cancel_processing(job_id)
     
-    async def test_start_processing(self):
-        """Test starting processing job."""
-        result = await self.router.start_processing("file_123")
-        
-        self.assertEqual(result["status"], "success")
-        self.assertIn("job_id", result)
-        self.assertIn("estimated_time", result)
-    
-    async def test_get_processing_status_existing(self):
-        """Test getting status of existing job."""
-        # Start a job first
-        start_result = await self.router.start_processing("file_123")
-        job_id = start_result["job_id"]
-        
-        # Check status
-        status_result = await self.router.get_processing_status(job_id)
-        
-        self.assertEqual(status_result["status"], "success")
-        self.assertIn("job_details", status_result)
-        self.assertEqual(status_result["job_details"]["job_id"], job_id)
+    assert cancel_result["status"] == "success"
+    assert cancel_result["job_id"] == job_id
     
-    async def test_get_processing_status_nonexistent(self):
-        """Test getting status of non-existent job."""
-        result = await self.router.get_processing_status("nonexistent_job")
-        
-        self.assertEqual(result["status"], "error")
-        self.assertEqual(result["code"], 404)
-    
-    async def test_cancel_processing_existing(self):
-        """Test cancelling existing job."""
-        # Start a job first
-        start_result = await self.router.start_processing("file_123")
-        job_id = start_result["job_id"]
-        
-        # Cancel the job
-        cancel_result = await self.router.cancel_processing(job_id)
-        
-        self.assertEqual(cancel_result["status"], "success")
-        self.assertEqual(cancel_result["job_id"], job_id)
-        
-        # Verify job is cancelled
-        status_result = await self.router.get_processing_status(job_id)
-        self.assertEqual(status_result["job_details"]["status"], "cancelled")
+    # Verify job is cancelled
+    status_result = await processing_router.get_processing_status(job_id)
+    assert status_result["job_details"]["status"] == "cancelled"
+
+
+async def test_cancel_processing_nonexistent(processing_router):
+    """Test cancelling non-existent job."""
+    result = await processing_router.cancel_processing("nonexistent_job")
     
-    async def test_cancel_processing_nonexistent(self):
-        """Test cancelling non-existent job."""
-        result = await self.router.cancel_processing("nonexistent_job")
-        
-        self.assertEqual(result["status"], "error")
-        self.assertEqual(result["code"], 404)
+    assert result["status"] == "error"
+    assert result["code"] == 404
+
+
+# ResultsRouter tests
+async def test_get_extraction_results(results_router):
+    """Test getting extraction results."""
+    result = await results_router.get_extraction_results("job_123")
+    
+    assert result["status"] == "success"
+    assert result["job_id"] == "job_123"
+    assert "results" in result
+    assert "invoice_number" in result["results"]
+
 
+async def test_export_results_json(results_router):
+    """Test exporting results as JSON."""
+    # First get results to populate store
+    await results_router.get_extraction_results("job_123")
+    
+    # Then export
+    result = await results_router.export_results("job_123", "json")
+    
+    assert result["status"] == "success"
+    assert result["format"] == "json"
+    assert "data" in result
+    assert "download_url" in result
 
-class TestResultsRouter(unittest.TestCase):
-    """Test cases for ResultsRouter."""
+
+async def test_export_results_csv(results_router):
+    """Test exporting results as CSV."""
+    # First get results to populate store
+    await results_router.get_extraction_results("job_123")
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.router = MockResultsRouter()
+    # Then export
+    result = await results_router.export_results("job_123", "csv")
     
-    async def test_get_extraction_results(self):
-        """Test getting extraction results."""
-        result = await self.router.get_extraction_results("job_123")
-        
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["job_id"], "job_123")
-        self.assertIn("results", result)
-        self.assertIn("invoice_number", result["results"])
-    
-    async def test_export_results_json(self):
-        """Test exporting results as JSON."""
-        # First get results to populate store
-        await self.router.get_extraction_results("job_123")
-        
-        # Then export
-        result = await self.router.export_results("job_123", "json")
-        
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["format"], "json")
-        self.assertIn("data", result)
-        self.assertIn("download_url", result)
-    
-    async def test_export_results_csv(self):
-        """Test exporting results as CSV."""
-        # First get results to populate store
-        await self.router.get_extraction_results("job_123")
-        
-        # Then export
-        result = await self.router.export_results("job_123", "csv")
-        
-        self.assertEqual(result["status"], "success")
-        self.assertEqual(result["format"], "csv")
-        self.assertIn("download_url", result)
+    assert result["status"] == "success"
+    assert result["format"] == "csv"
+    assert "download_url" in result
+
+
+async def test_export_results_unsupported_format(results_router):
+    """Test exporting with unsupported format."""
+    # First get results to populate store
+    await results_router.get_extraction_results("job_123")
     
-    async def test_export_results_unsupported_format(self):
-        """Test exporting with unsupported format."""
-        result = await self.router.export_results("job_123", "xml")
-        
-        self.assertEqual(result["status"], "error")
-        self.assertEqual(result["code"], 400)
-        self.assertIn("Unsupported format", result["message"])
+    # Then export
+    result = await results_router.export_results("job_123", "xml")
     
-    async def test_export_results_nonexistent_job(self):
-        """Test exporting results for non-existent job."""
-        result = await self.router.export_results("nonexistent_job", "json")
-        
-        self.assertEqual(result["status"], "error")
-        self.assertEqual(result["code"], 404)
+    assert result["status"] == "error"
+    assert result["code"] == 400
+    assert "Unsupported format" in result["message"]
 
 
-class TestHealthCheckRouter(unittest.TestCase):
-    """Test cases for HealthCheckRouter."""
+async def test_export_results_nonexistent_job(results_router):
+    """Test exporting results for non-existent job."""
+    result = await results_router.export_results("nonexistent_job", "json")
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.router = MockHealthCheckRouter()
+    assert result["status"] == "error"
+    assert result["code"] == 404
+
+
+# HealthCheckRouter tests
+async def test_basic_health_check(health_router):
+    """Test basic health check endpoint."""
+    result = await health_router.health_check()
+    
+    assert result["status"] == "healthy"
+    assert "timestamp" in result
+    assert "version" in result
+    assert "uptime" in result
+
+
+async def test_detailed_health_check_healthy(health_router):
+    """Test detailed health check when all services are healthy."""
+    result = await health_router.detailed_health_check()
     
-    async def test_basic_health_check(self):
-        """Test basic health check endpoint."""
-        result = await self.router.health_check()
-        
-        self.assertEqual(result["status"], "healthy")
-        self.assertIn("timestamp", result)
-        self.assertIn("version", result)
-        self.assertIn("uptime", result)
-    
-    async def test_detailed_health_check_healthy(self):
-        """Test detailed health check when all services are healthy."""
-        result = await self.router.detailed_health_check()
-        
-        self.assertEqual(result["status"], "healthy")
-        self.assertIn("services", result)
-        self.assertIn("system_info", result)
-        
-        # Check all services are healthy
-        for service_status in result["services"].values():
-            self.assertEqual(service_status, "healthy")
-    
-    async def test_detailed_health_check_degraded(self):
-        """Test detailed health check when a service is unhealthy."""
-        # Simulate unhealthy service
-        self.router.service_status["database"] = "unhealthy"
-        
-        result = await self.router.detailed_health_check()
-        
-        self.assertEqual(result["status"], "degraded")
-        self.assertEqual(result["services"]["database"], "unhealthy")
+    assert result["status"] == "healthy"
+    assert "services" in result
+    assert "system_info" in result
+    
+    # Check all services are healthy
+    for service_status in result["services"].values():
+        assert service_status == "healthy"
 
 
-class TestRouterIntegration(unittest.TestCase):
-    """Integration tests for router interactions."""
+async def test_detailed_health_check_degraded(health_router):
+    """Test detailed health check when a service is unhealthy."""
+    # Simulate unhealthy service
+    health_router.service_status["database"] = "unhealthy"
     
-    def setUp(self):
-        """Set up integration test fixtures."""
-        self.upload_router = MockInvoiceUploadRouter()
-        self.processing_router = MockProcessingRouter()
-        self.results_router = MockResultsRouter()
+    result = await health_router.detailed_health_check()
     
-    async def test_full_workflow_integration(self):
-        """Test complete workflow from upload to results."""
-        # Step 1: Upload file
-        mock_file = MockUploadFile("test.pdf", b"pdf content")
-        upload_result = await self.upload_router.upload_invoice(mock_file)
-        file_id = upload_result["file_id"]
-        
-        # Step 2: Start processing
-        process_result = await self.processing_router.start_processing(file_id)
-        job_id = process_result["job_id"]
-        
-        # Step 3: Check processing status
-        status_result = await self.processing_router.get_processing_status(job_id)
-        
-        # Step 4: Get results
-        results = await self.results_router.get_extraction_results(job_id)
-        
-        # Verify integration
-        self.assertEqual(upload_result["status"], "success")
-        self.assertEqual(process_result["status"], "success")
-        self.assertEqual(status_result["status"], "success")
-        self.assertEqual(results["status"], "success")
+    assert result["status"] == "degraded"
+    assert result["services"]["database"] == "unhealthy"
 
 
-# Async test runner helper
-def run_async_test(coro):
-    """Helper to run async tests."""
-    import asyncio
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+# Router integration tests
+async def test_full_workflow_integration(upload_router, processing_router, results_router):
+    """Test complete workflow from upload to results."""
+    # Step 1: Upload file
+    mock_file = MockUploadFile("test.pdf", b"%PDF-1.4 pdf content")
+    upload_result = await upload_router.upload_invoice(mock_file)
+    file_id = upload_result["file_id"]
+    
+    # Step 2: Start processing
+    process_result = await processing_router.start_processing(file_id)
+    job_id = process_result["job_id"]
+    
+    # Step 3: Check processing status
+    status_result = await processing_router.get_processing_status(job_id)
+    
+    # Step 4: Get results
+    results = await results_router.get_extraction_results(job_id)
+    
+    # Verify integration
+    assert upload_result["status"] == "success"
+    assert process_result["status"] == "success"
+    assert status_result["status"] == "success"
+    assert results["status"] == "success"
 
 
 if __name__ == '__main__':
-    # Convert async test methods to sync for unittest
-    for test_class in [TestInvoiceUploadRouter, TestProcessingRouter, 
-                      TestResultsRouter, TestHealthCheckRouter, TestRouterIntegration]:
-        for attr_name in dir(test_class):
-            attr = getattr(test_class, attr_name)
-            if callable(attr) and attr_name.startswith('test_') and hasattr(attr, '__code__'):
-                # Check if it's an async method
-                if attr.__code__.co_flags & 0x80:  # CO_COROUTINE flag
-                    # Wrap async method
-                    def make_sync_test(async_method):
-                        def sync_test(self):
-                            return run_async_test(async_method(self))
-                        return sync_test
-                    
-                    setattr(test_class, attr_name, make_sync_test(attr))
-    
     # Run tests with verbose output
-    unittest.main(verbosity=2)
\ No newline at end of file
+    pytest.main([__file__, "-v"])
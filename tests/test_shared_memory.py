@@ -0,0 +1,76 @@
+"""
+Test module for the shared memory store.
+
+The store runs against fakeredis, so the tests need no Redis server.
+"""
+
+from datetime import datetime
+
+import fakeredis
+import pytest
+
+from memory.shared_memory import SharedMemoryStore
+from models.schemas import BusinessIntent, ClassificationResult, FormatType, MemoryEntry
+
+
+@pytest.fixture
+def store():
+    memory = SharedMemoryStore()
+    memory.redis_client = fakeredis.FakeRedis()
+    return memory
+
+
+@pytest.fixture
+def entry_id(store):
+    entry = MemoryEntry(
+        id=store.generate_id(),
+        input_metadata={"source": "test"},
+        classification=ClassificationResult(
+            format_type=FormatType.EMAIL,
+            business_intent=BusinessIntent.RFQ,
+            confidence_score=0.9
+        ),
+        timestamp=datetime(2024, 1, 15, 12, 0)
+    )
+    return store.store_entry(entry)
+
+
+def test_update_entry_keeps_appends_made_between_read_and_write(store, entry_id, monkeypatch):
+    read_entry = store.get_entry
+    appended = []
+
+    def get_entry_then_append(requested_id):
+        # Another writer appends once update_entry has read the entry
+        entry = read_entry(requested_id)
+        if not appended:
+            appended.append(True)
+            store.add_agent_output(requested_id, "EmailAgent", {"decision": "late", "timestamp": "t1"})
+            store.add_actions_triggered(requested_id, ["notify_sales"])
+        return entry
+
+    monkeypatch.setattr(store, "get_entry", get_entry_then_append)
+    assert store.update_entry(entry_id, {"status": "completed"})
+    monkeypatch.undo()
+
+    entry = store.get_entry(entry_id)
+    assert entry.status == "completed"
+    assert entry.agent_outputs == {"EmailAgent": {"decision": "late", "timestamp": "t1"}}
+    assert entry.decision_trace == ["EmailAgent: t1"]
+    assert entry.actions_triggered == ["notify_sales"]
+
+
+def test_update_entry_folds_earlier_appends_into_the_entry(store, entry_id):
+    store.add_agent_output(entry_id, "EmailAgent", {"decision": "first", "timestamp": "t0"})
+    store.add_action_triggered(entry_id, "log_and_close")
+
+    assert store.update_entry(entry_id, {"status": "completed"})
+    store.add_action_triggered(entry_id, "archive")
+
+    entry = store.get_entry(entry_id)
+    assert entry.status == "completed"
+    assert entry.agent_outputs == {"EmailAgent": {"decision": "first", "timestamp": "t0"}}
+    assert entry.actions_triggered == ["log_and_close", "archive"]
+
+
+def test_update_missing_entry_returns_false(store):
+    assert store.update_entry("missing", {"status": "completed"}) is False
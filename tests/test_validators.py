@@ -0,0 +1,142 @@
+"""
+Test module for the validators' batch APIs.
+
+validate_many must return exactly what validate returns for each item,
+in item order, however the items are split into batches.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from utils.validators import EmailValidator, InvoiceValidator, WebhookValidator
+
+
+def _emails(count):
+    # Alternate valid and invalid emails so the results differ item to item
+    return [
+        f"From: sender{i}@example.com\nTo: {f'rcpt{i}@example.com' if i % 2 else 'not-an-address'}\n"
+        f"Subject: Order {i}\n\nThank you for order number {i}."
+        for i in range(count)
+    ]
+
+
+def _invoices(count):
+    return [
+        {"invoice_number": f"INV-{i}", "date": "2024-01-15", "total": "$1,000.00" if i % 3 else "n/a"}
+        for i in range(count)
+    ]
+
+
+def _webhooks(count):
+    return [{"type": "order.created" if i % 2 else "", "data": {"id": i}} for i in range(count)]
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """Thread pool that records how many batches were submitted to it."""
+    
+    def __init__(self):
+        super().__init__(max_workers=4)
+        self.submitted = 0
+    
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+@pytest.fixture
+def executor():
+    pool = CountingExecutor()
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.parametrize("validator_cls, make_items", [
+    (EmailValidator, _emails),
+    (InvoiceValidator, _invoices),
+    (WebhookValidator, _webhooks)
+])
+@pytest.mark.parametrize("count, batch_size", [(0, 4), (1, 4), (4, 4), (5, 4), (23, 4), (23, 64)])
+async def test_validate_many_matches_validate_in_item_order(validator_cls, make_items, count, batch_size, executor):
+    items = make_items(count)
+    reference = validator_cls()
+    expected = [reference.validate(item) for item in items]
+
+    results = await validator_cls().validate_many(items, batch_size=batch_size, executor=executor)
+
+    assert results == expected
+    assert executor.submitted == -(-count // batch_size)
+
+
+async def test_validate_many_accepts_a_generator(executor):
+    results = await EmailValidator().validate_many((email for email in _emails(9)), batch_size=2, executor=executor)
+
+    assert [result["is_valid"] for result in results] == [bool(i % 2) for i in range(9)]
+
+
+async def test_validate_many_runs_in_worker_processes():
+    items = _invoices(10)
+    expected = [InvoiceValidator().validate(item) for item in items]
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        results = await InvoiceValidator().validate_many(items, batch_size=3, executor=pool)
+
+    assert results == expected
+
+
+def _baseline_score(errors, warnings, error_weight, warning_weight):
+    # The per-validator formula score_batch replaced, step for step
+    score = 1.0
+    score -= errors * error_weight
+    score -= warnings * warning_weight
+    return max(0.0, score)
+
+
+@pytest.mark.parametrize("validator_cls", [EmailValidator, InvoiceValidator, WebhookValidator])
+def test_score_batch_is_bit_identical_to_per_result_score(validator_cls):
+    counts = [(errors, warnings) for errors in range(12) for warnings in range(25)]
+    error_counts, warning_counts = zip(*counts)
+
+    scores = validator_cls.score_batch(error_counts, warning_counts)
+
+    validator = validator_cls()
+    for (errors, warnings), score in zip(counts, scores):
+        validator.error_count, validator.warning_count = errors, warnings
+        assert score.hex() == validator._calculate_quality_score().hex()
+        assert score.hex() == _baseline_score(
+            errors, warnings, validator_cls.ERROR_WEIGHT, validator_cls.WARNING_WEIGHT
+        ).hex()
+    assert len(scores) == len(counts)
+
+
+@pytest.mark.parametrize("validator_cls, args", [
+    (EmailValidator, ("From: someone@example.com\nSubject: Hello\n\nurgent, act now",)),
+    # Webhook results are cached by raw body
+    (WebhookValidator, ({"type": "", "data": {"id": 1}}, b'{"type": "", "data": {"id": 1}}'))
+])
+def test_cached_results_are_logged_again(validator_cls, args, caplog):
+    validator = validator_cls()
+
+    with caplog.at_level("WARNING", logger="utils.validators"):
+        first = validator.validate(*args)
+        first_records = [(record.levelname, record.getMessage()) for record in caplog.records]
+        caplog.clear()
+        second = validator.validate(*args)
+        second_records = [(record.levelname, record.getMessage()) for record in caplog.records]
+
+    assert second == first
+    assert first_records and second_records == first_records
+
+
+def test_format_checks_keep_dollar_anchoring():
+    # The original patterns end in $, which also accepts one trailing newline
+    assert EmailValidator().is_valid_email("a@b.com\n")
+    assert not EmailValidator().is_valid_email("a@b.com\n\n")
+
+    clean = InvoiceValidator().validate({"invoice_number": "INV-1", "date": "2024-01-15", "total": "$10.00"})
+    trailing = InvoiceValidator().validate({"invoice_number": "INV-1\n", "date": "2024-01-15", "total": "$10.00"})
+    assert trailing == clean
+
+    clean = WebhookValidator().validate({"type": "order.created", "data": {"id": 1}})
+    trailing = WebhookValidator().validate({"type": "order.created\n", "data": {"id": 1}})
+    assert trailing["warnings"] == clean["warnings"]
@@ -0,0 +1,61 @@
+"""
+Executors Utility
+
+This module provides the shared process pool that agents use to run
+CPU-bound regex and string work off the event loop.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+_cpu_pool: Optional[ProcessPoolExecutor] = None
+
+
+def start_cpu_pool() -> ProcessPoolExecutor:
+    """
+    Create the process pool for CPU-bound agent work if it is not running.
+
+    Processes rather than threads, since the work holds the GIL. Workers come
+    from a fork server, so they are never forked from a process that is
+    already running threads (the event loop's to_thread helpers), which can
+    deadlock on locks held by those threads. The app starts the pool at
+    startup and shuts it down with shutdown_cpu_pool.
+
+    Returns:
+        ProcessPoolExecutor: Pool sized to the number of CPUs
+    """
+    global _cpu_pool
+    if _cpu_pool is None:
+        _cpu_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("forkserver")
+        )
+    return _cpu_pool
+
+
+def get_cpu_pool() -> ProcessPoolExecutor:
+    """
+    Return the process pool for CPU-bound agent work.
+
+    Outside the app (scripts, tests) the pool is started on first use, so
+    importing an agent does not start worker processes.
+
+    Returns:
+        ProcessPoolExecutor: Pool sized to the number of CPUs
+    """
+    return _cpu_pool or start_cpu_pool()
+
+
+def shutdown_cpu_pool(wait: bool = True) -> None:
+    """
+    Shut the process pool down; a later get_cpu_pool starts a fresh one.
+
+    Args:
+        wait (bool): Block until queued work finishes and the workers exit
+    """
+    global _cpu_pool
+    pool, _cpu_pool = _cpu_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
@@ -1,9 +1,16 @@
-from .pdf_parser import PDFParser
+from .pdf_parser import PDFParser, PDFParserBatchWorker
 from .validators import EmailValidator, InvoiceValidator, WebhookValidator
+from .keyword_matcher import KeywordMatcher
+from .executors import get_cpu_pool, start_cpu_pool, shutdown_cpu_pool
 
 __all__ = [
     'PDFParser',
+    'PDFParserBatchWorker',
     'EmailValidator', 
     'InvoiceValidator',
-    'WebhookValidator'
+    'WebhookValidator',
+    'KeywordMatcher',
+    'get_cpu_pool',
+    'start_cpu_pool',
+    'shutdown_cpu_pool'
 ]
\ No newline at end of file
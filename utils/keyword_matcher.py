@@ -0,0 +1,53 @@
+"""
+Keyword Matcher Utility
+
+This module provides single-pass multi-keyword matching, used by agents that
+check text against many literal keywords at once.
+"""
+
+import re
+import sys
+from typing import Iterable, Set
+
+
+class KeywordMatcher:
+    """Find every keyword occurring in a text with a single scan.
+
+    Behaves like an Aho-Corasick automaton built on the stdlib ``re`` engine:
+    all keywords are compiled into one lookahead alternation, so overlapping
+    keywords (e.g. ``'low priority'`` and ``'priority'``) are all reported,
+    matching the semantics of ``keyword in text`` for each keyword.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(dict.fromkeys(sys.intern(keyword.lower()) for keyword in keywords))
+
+        # Longest first, so the alternation reports the longest keyword starting
+        # at each position; shorter keywords at the same position are prefixes.
+        ordered = sorted(self.keywords, key=len, reverse=True)
+        self._pattern = re.compile(
+            '(?=(' + '|'.join(re.escape(keyword) for keyword in ordered) + '))'
+        ) if self.keywords else None
+
+        self._prefixes = {
+            keyword: [other for other in self.keywords if keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+
+    def find(self, text_lower: str) -> Set[str]:
+        """
+        Return the set of keywords present in already-lowercased text.
+
+        Args:
+            text_lower (str): Text to scan, lowercased by the caller
+
+        Returns:
+            Set[str]: Keywords found in the text
+        """
+        found = set()
+        if self._pattern is None:
+            return found
+
+        for match in self._pattern.finditer(text_lower):
+            found.update(self._prefixes[match.group(1)])
+        return found
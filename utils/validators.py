@@ -5,69 +5,360 @@ This module contains validation classes for different document types
 including emails, invoices, and webhooks.
 """
 
+import asyncio
 import re
+import sys
 import json
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
+from itertools import chain, islice
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple, Type, Union
 from datetime import datetime
+from utils.executors import get_cpu_pool
+from utils.keyword_matcher import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
+# Max results each validator keeps for repeated (retried or replayed) content
+VALIDATION_CACHE_SIZE = 4096
+
+# Max error and warning messages kept per result; further ones are still counted
+MAX_RESULT_MESSAGES = 32
+
+# validate_many: documents per worker call, and max worker calls in flight
+VALIDATE_BATCH_SIZE = 64
+VALIDATE_MAX_CONCURRENCY = 50
+
+_EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+
+_EMAIL_RE = re.compile(rf'^{_EMAIL_PATTERN}$')
+
+# A comma-separated address list whose entries are all valid once stripped, and
+# each entry of a list that is not, so one scan checks a whole list
+_ADDRESS_LIST_RE = re.compile(rf'\s*{_EMAIL_PATTERN}\s*(?:,\s*{_EMAIL_PATTERN}\s*)*')
+_INVALID_ADDRESS_RE = re.compile(rf'(?<![^,])(?!\s*{_EMAIL_PATTERN}\s*(?:,|\Z))[^,]*')
+_INVNUM_RE = re.compile(r'^[A-Z0-9-]+$')
+_EVENTTYPE_RE = re.compile(r'^[a-zA-Z0-9._-]+$')
+
+# YYYY-MM-DD / YYYY/MM/DD, or MM-DD-YYYY / DD-MM-YYYY with either separator
+# (used consistently, as in the strptime formats this replaces). Like strptime's
+# %d, a day may be a single digit padded with a space
+_DATE_RE = re.compile(
+    r'^(?:(\d{4})([-/])([0-9]{1,2})\2([0-9]{1,2}| [1-9])'
+    r'|([0-9]{1,2}| [1-9])([-/])([0-9]{1,2}| [1-9])\6(\d{4}))\Z'
+)
+
+# Deletes the '$' and ',' allowed in money amounts
+_MONEY_STRIP = str.maketrans('', '', '$,')
+
+# Spam phrases, matched in one scan of the lowercased email
+_SPAM_MATCHER = KeywordMatcher([
+    'urgent', 'act now', 'limited time', 'click here',
+    'free money', 'guaranteed', 'risk free', 'no obligation'
+])
+
+# Header name -> (field, header tokens removed from the value)
+_EMAIL_HEADERS = {
+    'From': ('from', ('From:',)),
+    'To': ('to', ('To:',)),
+    'CC': ('cc', ('CC:', 'Cc:')),
+    'Cc': ('cc', ('CC:', 'Cc:')),
+    'BCC': ('bcc', ('BCC:', 'Bcc:')),
+    'Bcc': ('bcc', ('BCC:', 'Bcc:')),
+    'Subject': ('subject', ('Subject:',)),
+    'Date': ('date', ('Date:',))
+}
+
+
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _match_date(date_str: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Parse a date in one of the supported formats without trial strptime calls.
+
+    Day-first and month-first dates share a shape, so month-first is tried
+    before day-first.
+
+    Args:
+        date_str (str): Date string to parse
+
+    Returns:
+        Optional[Tuple[int, int, int]]: (year, month, day), or None if no format fits
+    """
+    match = _DATE_RE.match(date_str.strip())
+    if match is None:
+        return None
+    
+    year, _, month, day, first, _, second, year_last = match.groups()
+    if year is not None:
+        candidates = ((year, month, day),)
+    else:
+        candidates = ((year_last, first, second), (year_last, second, first))
+    
+    for y, m, d in candidates:
+        if m[0] == ' ':
+            continue
+        y, m, d = int(y), int(m), int(d)
+        if y < 1 or not 1 <= m <= 12 or d < 1:
+            continue
+        leap_day = m == 2 and y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)
+        if d <= _DAYS_IN_MONTH[m] + leap_day:
+            return y, m, d
+    return None
+
+def _timestamp_format(timestamp: str) -> Optional[str]:
+    """
+    Pick the only ISO timestamp format a string could match.
+
+    The formats differ in how they end (Z or digits), whether they have
+    fractional seconds, and whether a T (matched case-insensitively by
+    strptime) or whitespace separates date and time.
+
+    Args:
+        timestamp (str): Timestamp string
+
+    Returns:
+        Optional[str]: strptime format to try, or None if none can match
+    """
+    last = timestamp[-1:]
+    if last in ('Z', 'z'):
+        return '%Y-%m-%dT%H:%M:%S.%fZ' if '.' in timestamp else '%Y-%m-%dT%H:%M:%SZ'
+    if last.isdecimal():
+        if 'T' in timestamp or 't' in timestamp:
+            return '%Y-%m-%dT%H:%M:%S%z'
+        return '%Y-%m-%d %H:%M:%S'
+    return None
+
+class _FieldMessages(dict):
+    """Field name -> interned message from a template, built on first use."""
+    
+    def __init__(self, template: str):
+        super().__init__()
+        self.template = template
+    
+    def __missing__(self, field: str) -> str:
+        message = self[field] = sys.intern(self.template.format(field))
+        return message
+
+# Fixed per-field messages are built once and shared by every validation
+_MISSING_FIELD_ERRORS = _FieldMessages("Missing required field: {}")
+_EMPTY_FIELD_ERRORS = _FieldMessages("Required field cannot be empty: {}")
+
+def _compile_required_check(fields: Iterable[str], report_empty: bool = False) -> Callable[[Any, Callable[[str], None]], None]:
+    """
+    Generate a required-field check specialized to a fixed list of fields.
+
+    The generated function tests each field with straight-line code and
+    literal messages instead of looping over the field list on every call.
+    Changes to the list after compiling are not picked up.
+
+    Args:
+        fields (Iterable[str]): Required field names
+        report_empty (bool): Report fields present as None or "" as empty;
+            otherwise any falsy value counts as missing
+
+    Returns:
+        Callable[[Any, Callable[[str], None]], None]: check(data, add_error)
+    """
+    lines = ['def check(data, add_error):']
+    for field in fields:
+        key = repr(field)
+        missing = repr(_MISSING_FIELD_ERRORS[field])
+        if report_empty:
+            lines += [
+                f'    if {key} not in data:',
+                f'        add_error({missing})',
+                f'    elif data[{key}] is None or data[{key}] == "":',
+                f'        add_error({_EMPTY_FIELD_ERRORS[field]!r})'
+            ]
+        else:
+            lines += [
+                f'    if {key} not in data or not data[{key}]:',
+                f'        add_error({missing})'
+            ]
+    lines.append('    return None')
+    
+    namespace = {}
+    exec('\n'.join(lines), namespace)
+    return namespace['check']
+
+def _content_key(content: Union[bytes, str]) -> bytes:
+    """
+    Hash content into a compact validation cache key.
+
+    Args:
+        content (Union[bytes, str]): Content the validation result depends on
+
+    Returns:
+        bytes: 16-byte BLAKE2b digest
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8', 'surrogatepass')
+    return hashlib.blake2b(content, digest_size=16).digest()
+
 class BaseValidator:
     """Base validator class with common validation methods."""
     
+    # Quality score penalty per error and per warning
+    ERROR_WEIGHT = 0.0
+    WARNING_WEIGHT = 0.0
+    
     def __init__(self):
         self.errors = []
         self.warnings = []
+        self.error_count = 0
+        self.warning_count = 0
+        # Content key -> (errors, warnings, error_count, warning_count, is_valid, score),
+        # least recently used first
+        self._cache = OrderedDict()
     
     def reset(self):
         """Reset error and warning lists."""
         self.errors = []
         self.warnings = []
+        self.error_count = 0
+        self.warning_count = 0
     
     def add_error(self, message: str):
         """Add an error message."""
-        self.errors.append(message)
-        logger.error(f"Validation error: {message}")
+        self.error_count += 1
+        if self.error_count <= MAX_RESULT_MESSAGES:
+            self.errors.append(message)
     
     def add_warning(self, message: str):
         """Add a warning message."""
-        self.warnings.append(message)
-        logger.warning(f"Validation warning: {message}")
+        self.warning_count += 1
+        if self.warning_count <= MAX_RESULT_MESSAGES:
+            self.warnings.append(message)
+    
+    def _log_messages(self):
+        """Log the collected errors and warnings, one record per level."""
+        if self.error_count and logger.isEnabledFor(logging.ERROR):
+            logger.error("Validation errors:\n%s", self._format_messages(self.errors, self.error_count))
+        if self.warning_count and logger.isEnabledFor(logging.WARNING):
+            logger.warning("Validation warnings:\n%s", self._format_messages(self.warnings, self.warning_count))
+    
+    def _format_messages(self, messages: List[str], count: int) -> str:
+        """Join kept messages one per line, noting any that were not kept."""
+        text = '\n'.join(messages)
+        if count > len(messages):
+            text += f"\n... and {count - len(messages)} more"
+        return text
+    
+    def _cached_validate(self, key: Optional[bytes], validate: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the result cached under key, running validate on a miss."""
+        if key is None:
+            return validate()
+        
+        cached = self._cache.get(key)
+        if cached is None:
+            result = validate()
+            self._cache[key] = (
+                tuple(self.errors), tuple(self.warnings),
+                self.error_count, self.warning_count,
+                result['is_valid'], result['score']
+            )
+            if len(self._cache) > VALIDATION_CACHE_SIZE:
+                self._cache.popitem(last=False)
+            return result
+        
+        # Restore the validator state the cached run left behind
+        self._cache.move_to_end(key)
+        errors, warnings, self.error_count, self.warning_count, is_valid, score = cached
+        self.errors = list(errors)
+        self.warnings = list(warnings)
+        # Repeated documents are logged like first-time ones
+        self._log_messages()
+        return {
+            'is_valid': is_valid,
+            'errors': self.errors,
+            'warnings': self.warnings,
+            'score': score
+        }
+    
+    async def validate_many(self, items: Iterable[Any], max_concurrency: int = VALIDATE_MAX_CONCURRENCY,
+                            batch_size: int = VALIDATE_BATCH_SIZE,
+                            executor: Optional[Executor] = None) -> List[Dict[str, Any]]:
+        """
+        Validate many documents concurrently in worker processes.
+        
+        Validators keep per-call state, so documents are not validated on this
+        instance; each worker validates its batches with its own instance of
+        this validator's class.
+        
+        Args:
+            items (Iterable[Any]): Documents, each as passed to validate
+            max_concurrency (int): Max batches being validated at once
+            batch_size (int): Documents sent to a worker per call
+            executor (Optional[Executor]): Pool to use; the shared CPU pool when not given
+            
+        Returns:
+            List[Dict[str, Any]]: Validation results in item order
+        """
+        loop = asyncio.get_running_loop()
+        pool = executor or get_cpu_pool()
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run_batch(batch: List[Any]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await loop.run_in_executor(pool, _validate_batch, type(self), batch)
+        
+        iterator = iter(items)
+        batches = iter(lambda: list(islice(iterator, batch_size)), [])
+        results = await asyncio.gather(*(run_batch(batch) for batch in batches))
+        return list(chain.from_iterable(results))
+    
+    def _calculate_quality_score(self) -> float:
+        """Calculate quality score (0-1)."""
+        return max(0.0, 1.0 - self.error_count * self.ERROR_WEIGHT - self.warning_count * self.WARNING_WEIGHT)
+    
+    @classmethod
+    def score_batch(cls, error_counts: Iterable[int], warning_counts: Iterable[int]) -> List[float]:
+        """
+        Calculate quality scores (0-1) for many results at once.
+        
+        Args:
+            error_counts (Iterable[int]): Number of errors in each result
+            warning_counts (Iterable[int]): Number of warnings in each result
+            
+        Returns:
+            List[float]: Score for each result
+        """
+        error_weight = cls.ERROR_WEIGHT
+        warning_weight = cls.WARNING_WEIGHT
+        return [
+            max(0.0, 1.0 - errors * error_weight - warnings * warning_weight)
+            for errors, warnings in zip(error_counts, warning_counts)
+        ]
     
     def is_valid_email(self, email: str) -> bool:
         """Validate email address format."""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return _EMAIL_RE.match(email) is not None
     
     def is_valid_phone(self, phone: str) -> bool:
         """Validate phone number format."""
-        # Remove all non-digit characters
-        digits_only = re.sub(r'\D', '', phone)
-        return len(digits_only) >= 10
+        # Count the digits (str.isdecimal matches exactly what \d does)
+        return sum(map(str.isdecimal, phone)) >= 10
     
     def is_valid_date(self, date_str: str) -> bool:
         """Validate date string format."""
-        date_patterns = [
-            '%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y',
-            '%Y/%m/%d', '%m-%d-%Y', '%d-%m-%Y'
-        ]
-        
-        for pattern in date_patterns:
-            try:
-                datetime.strptime(date_str.strip(), pattern)
-                return True
-            except ValueError:
-                continue
-        return False
+        return _match_date(date_str) is not None
 
 class EmailValidator(BaseValidator):
     """Validator for email documents."""
     
+    ERROR_WEIGHT = 0.2  # Errors heavily penalized
+    WARNING_WEIGHT = 0.1  # Warnings lightly penalized
+    
     def __init__(self):
         super().__init__()
         self.required_fields = ['from', 'to', 'subject']
         self.optional_fields = ['body', 'cc', 'bcc', 'date']
+        self._check_required = _compile_required_check(self.required_fields)
     
     def validate(self, content: str) -> Dict[str, Any]:
         """
@@ -79,6 +370,11 @@ class EmailValidator(BaseValidator):
         Returns:
             Dict[str, Any]: Validation result with errors and warnings
         """
+        key = _content_key(content) if isinstance(content, str) else None
+        return self._cached_validate(key, lambda: self._validate(content))
+    
+    def _validate(self, content: str) -> Dict[str, Any]:
+        """Run the email checks."""
         self.reset()
         
         if not content or not content.strip():
@@ -114,18 +410,14 @@ class EmailValidator(BaseValidator):
             if not line and not in_body:
                 continue
             
-            if line.startswith('From:'):
-                email_data['from'] = line.replace('From:', '').strip()
-            elif line.startswith('To:'):
-                email_data['to'] = line.replace('To:', '').strip()
-            elif line.startswith('CC:') or line.startswith('Cc:'):
-                email_data['cc'] = line.replace('CC:', '').replace('Cc:', '').strip()
-            elif line.startswith('BCC:') or line.startswith('Bcc:'):
-                email_data['bcc'] = line.replace('BCC:', '').replace('Bcc:', '').strip()
-            elif line.startswith('Subject:'):
-                email_data['subject'] = line.replace('Subject:', '').strip()
-            elif line.startswith('Date:'):
-                email_data['date'] = line.replace('Date:', '').strip()
+            # One split and lookup instead of testing every header prefix
+            name, sep, value = line.partition(':')
+            header = _EMAIL_HEADERS.get(name) if sep else None
+            if header:
+                field, tokens = header
+                for token in tokens:
+                    value = value.replace(token, '')
+                email_data[field] = value.strip()
             else:
                 in_body = True
                 if line:
@@ -138,9 +430,7 @@ class EmailValidator(BaseValidator):
     
     def _validate_required_fields(self, email_data: Dict[str, str]):
         """Validate that all required fields are present."""
-        for field in self.required_fields:
-            if field not in email_data or not email_data[field]:
-                self.add_error(f"Missing required field: {field}")
+        self._check_required(email_data, self.add_error)
     
     def _validate_email_addresses(self, email_data: Dict[str, str]):
         """Validate email address formats."""
@@ -149,11 +439,11 @@ class EmailValidator(BaseValidator):
         for field in email_fields:
             if field in email_data and email_data[field]:
                 # Handle multiple email addresses separated by commas
-                addresses = [addr.strip() for addr in email_data[field].split(',')]
-                
-                for addr in addresses:
-                    if not self.is_valid_email(addr):
-                        self.add_error(f"Invalid email address in {field}: {addr}")
+                addresses = email_data[field]
+                if _ADDRESS_LIST_RE.fullmatch(addresses):
+                    continue
+                for match in _INVALID_ADDRESS_RE.finditer(addresses):
+                    self.add_error(f"Invalid email address in {field}: {match.group().strip()}")
     
     def _validate_content_structure(self, email_data: Dict[str, str]):
         """Validate email content structure."""
@@ -175,40 +465,34 @@ class EmailValidator(BaseValidator):
     
     def _check_spam_indicators(self, content: str):
         """Check for common spam indicators."""
-        spam_keywords = [
-            'urgent', 'act now', 'limited time', 'click here',
-            'free money', 'guaranteed', 'risk free', 'no obligation'
-        ]
-        
-        content_lower = content.lower()
-        found_spam_words = [word for word in spam_keywords if word in content_lower]
+        hits = _SPAM_MATCHER.find(content.lower())
+        found_spam_words = [word for word in _SPAM_MATCHER.keywords if word in hits]
         
         if found_spam_words:
             self.add_warning(f"Potential spam indicators found: {', '.join(found_spam_words)}")
     
     def _build_result(self) -> Dict[str, Any]:
         """Build validation result."""
+        self._log_messages()
         return {
-            'is_valid': len(self.errors) == 0,
+            'is_valid': self.error_count == 0,
             'errors': self.errors,
             'warnings': self.warnings,
             'score': self._calculate_quality_score()
         }
-    
-    def _calculate_quality_score(self) -> float:
-        """Calculate email quality score (0-1)."""
-        score = 1.0
-        score -= len(self.errors) * 0.2  # Errors heavily penalized
-        score -= len(self.warnings) * 0.1  # Warnings lightly penalized
-        return max(0.0, score)
+
 
 class InvoiceValidator(BaseValidator):
     """Validator for invoice documents."""
     
+    ERROR_WEIGHT = 0.25  # Errors heavily penalized
+    WARNING_WEIGHT = 0.1  # Warnings lightly penalized
+    
     def __init__(self):
         super().__init__()
         self.required_fields = ['invoice_number', 'date', 'total']
         self.optional_fields = ['vendor', 'po_number', 'due_date', 'items']
+        self._check_required = _compile_required_check(self.required_fields)
     
     def validate(self, invoice_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -229,26 +513,24 @@ class InvoiceValidator(BaseValidator):
         # Validate required fields
         self._validate_required_fields(invoice_data)
         
-        # Validate data formats
-        self._validate_data_formats(invoice_data)
+        # Validate data formats, keeping the parsed total
+        total = self._validate_data_formats(invoice_data)
         
         # Business logic validation
-        self._validate_business_logic(invoice_data)
+        self._validate_business_logic(invoice_data, total)
         
         return self._build_result()
     
     def _validate_required_fields(self, invoice_data: Dict[str, Any]):
         """Validate that all required fields are present."""
-        for field in self.required_fields:
-            if field not in invoice_data or not invoice_data[field]:
-                self.add_error(f"Missing required field: {field}")
+        self._check_required(invoice_data, self.add_error)
     
-    def _validate_data_formats(self, invoice_data: Dict[str, Any]):
-        """Validate data format consistency."""
+    def _validate_data_formats(self, invoice_data: Dict[str, Any]) -> Optional[float]:
+        """Validate data format consistency, returning the parsed total if valid."""
         # Validate invoice number format
         if 'invoice_number' in invoice_data:
             inv_num = str(invoice_data['invoice_number'])
-            if not re.match(r'^[A-Z0-9-]+$', inv_num):
+            if not _INVNUM_RE.match(inv_num):
                 self.add_warning("Invoice number contains unusual characters")
         
         # Validate date format
@@ -262,14 +544,14 @@ class InvoiceValidator(BaseValidator):
                 self.add_error("Invalid due date format")
         
         # Validate total amount
+        total = None
         if 'total' in invoice_data:
-            total = str(invoice_data['total']).replace('$', '').replace(',', '')
-            try:
-                float(total)
-            except ValueError:
+            total = self._parse_amount(invoice_data['total'])
+            if total is None:
                 self.add_error("Invalid total amount format")
+        return total
     
-    def _validate_business_logic(self, invoice_data: Dict[str, Any]):
+    def _validate_business_logic(self, invoice_data: Dict[str, Any], total: Optional[float]):
         """Validate business logic rules."""
         # Check if due date is after invoice date
         if 'date' in invoice_data and 'due_date' in invoice_data:
@@ -282,67 +564,70 @@ class InvoiceValidator(BaseValidator):
             except:
                 pass  # Date parsing issues already caught above
         
-        # Check for reasonable total amount
-        if 'total' in invoice_data:
-            try:
-                total = float(str(invoice_data['total']).replace('$', '').replace(',', ''))
-                if total < 0:
-                    self.add_error("Total amount cannot be negative")
-                elif total > 1000000:  # $1M threshold
-                    self.add_warning("Total amount is very large (>$1,000,000)")
-                elif total == 0:
-                    self.add_warning("Total amount is zero")
-            except:
-                pass  # Format issues already caught above
-    
-    def _parse_date(self, date_str: str) -> Optional[datetime]:
-        """Parse date string to datetime object."""
-        date_patterns = [
-            '%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y',
-            '%Y/%m/%d', '%m-%d-%Y', '%d-%m-%Y'
-        ]
-        
-        for pattern in date_patterns:
-            try:
-                return datetime.strptime(date_str.strip(), pattern)
-            except ValueError:
-                continue
-        return None
+        # Check for reasonable total amount (format issues already caught above)
+        if total is not None:
+            if total < 0:
+                self.add_error("Total amount cannot be negative")
+            elif total > 1000000:  # $1M threshold
+                self.add_warning("Total amount is very large (>$1,000,000)")
+            elif total == 0:
+                self.add_warning("Total amount is zero")
+    
+    def _parse_amount(self, value: Any) -> Optional[float]:
+        """Parse a money amount, ignoring '$' and thousands separators."""
+        text = value if isinstance(value, str) else str(value)
+        try:
+            return float(text.translate(_MONEY_STRIP))
+        except ValueError:
+            return None
+    
+    def _parse_date(self, date_str: str) -> Optional[Tuple[int, int, int]]:
+        """Parse date string to a (year, month, day) tuple, which orders like the date."""
+        return _match_date(date_str)
     
     def _build_result(self) -> Dict[str, Any]:
         """Build validation result."""
+        self._log_messages()
         return {
-            'is_valid': len(self.errors) == 0,
+            'is_valid': self.error_count == 0,
             'errors': self.errors,
             'warnings': self.warnings,
             'score': self._calculate_quality_score()
         }
-    
-    def _calculate_quality_score(self) -> float:
-        """Calculate invoice quality score (0-1)."""
-        score = 1.0
-        score -= len(self.errors) * 0.25  # Errors heavily penalized
-        score -= len(self.warnings) * 0.1  # Warnings lightly penalized
-        return max(0.0, score)
+
 
 class WebhookValidator(BaseValidator):
     """Validator for webhook payloads."""
     
+    ERROR_WEIGHT = 0.3  # Errors heavily penalized
+    WARNING_WEIGHT = 0.05  # Warnings lightly penalized
+    
     def __init__(self):
         super().__init__()
         self.required_fields = ['type', 'data']
         self.optional_fields = ['id', 'timestamp', 'source', 'version']
+        # A present but None or "" field is reported as empty rather than missing
+        self._check_required = _compile_required_check(self.required_fields, report_empty=True)
     
-    def validate(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def validate(self, payload: Dict[str, Any], raw: Optional[Union[bytes, str]] = None) -> Dict[str, Any]:
         """
         Validate webhook payload structure and content.
         
         Args:
             payload (Dict[str, Any]): Webhook payload to validate
+            raw (Optional[Union[bytes, str]]): Body the payload was parsed from, if
+                available; its size is checked instead of re-serializing the payload
             
         Returns:
             Dict[str, Any]: Validation result with errors and warnings
         """
+        # Only the raw body identifies a payload; a parsed one may hold values
+        # (e.g. tuples) that serialize alike but validate differently
+        key = _content_key(raw) if raw is not None else None
+        return self._cached_validate(key, lambda: self._validate(payload, raw))
+    
+    def _validate(self, payload: Dict[str, Any], raw: Optional[Union[bytes, str]] = None) -> Dict[str, Any]:
+        """Run the webhook checks."""
         self.reset()
         
         if not payload:
@@ -359,7 +644,7 @@ class WebhookValidator(BaseValidator):
         self._validate_field_formats(payload)
         
         # Validate payload size
-        self._validate_payload_size(payload)
+        self._validate_payload_size(payload, raw)
         
         return self._build_result()
     
@@ -376,11 +661,7 @@ class WebhookValidator(BaseValidator):
     
     def _validate_required_fields(self, payload: Dict[str, Any]):
         """Validate that all required fields are present."""
-        for field in self.required_fields:
-            if field not in payload:
-                self.add_error(f"Missing required field: {field}")
-            elif payload[field] is None or payload[field] == "":
-                self.add_error(f"Required field cannot be empty: {field}")
+        self._check_required(payload, self.add_error)
     
     def _validate_field_formats(self, payload: Dict[str, Any]):
         """Validate specific field formats."""
@@ -395,7 +676,7 @@ class WebhookValidator(BaseValidator):
             event_type = payload['type']
             if not isinstance(event_type, str) or len(event_type) < 1:
                 self.add_error("Event type must be a non-empty string")
-            elif not re.match(r'^[a-zA-Z0-9._-]+$', event_type):
+            elif not _EVENTTYPE_RE.match(event_type):
                 self.add_warning("Event type contains unusual characters")
         
         # Validate ID format if present
@@ -410,10 +691,19 @@ class WebhookValidator(BaseValidator):
             if not isinstance(source, str):
                 self.add_error("Source must be a string")
     
-    def _validate_payload_size(self, payload: Dict[str, Any]):
+    def _validate_payload_size(self, payload: Dict[str, Any], raw: Optional[Union[bytes, str]] = None):
         """Validate webhook payload size."""
-        payload_str = json.dumps(payload)
-        size_bytes = len(payload_str.encode('utf-8'))
+        if isinstance(raw, bytes):
+            size_bytes = len(raw)
+        elif raw is not None:
+            # Every character is at least one UTF-8 byte and an ASCII one exactly
+            # one, so only non-ASCII text within the limit needs encoding to measure
+            size_bytes = len(raw)
+            if size_bytes <= 1048576 and not raw.isascii():
+                size_bytes = len(raw.encode('utf-8'))
+        else:
+            # ensure_ascii escapes everything else, so characters and bytes are equal
+            size_bytes = len(json.dumps(payload, ensure_ascii=True))
         
         # Common webhook size limits
         if size_bytes > 1048576:  # 1MB
@@ -434,35 +724,39 @@ class WebhookValidator(BaseValidator):
                 return False
         
         elif isinstance(timestamp, str):
-            # ISO format timestamps
-            iso_patterns = [
-                '%Y-%m-%dT%H:%M:%SZ',
-                '%Y-%m-%dT%H:%M:%S.%fZ',
-                '%Y-%m-%d %H:%M:%S',
-                '%Y-%m-%dT%H:%M:%S%z'
-            ]
-            
-            for pattern in iso_patterns:
+            # ISO format timestamps; only one format can fit, so parse just that one
+            pattern = _timestamp_format(timestamp)
+            if pattern is not None:
                 try:
                     datetime.strptime(timestamp, pattern)
                     return True
                 except ValueError:
-                    continue
+                    pass
         
         return False
     
     def _build_result(self) -> Dict[str, Any]:
         """Build validation result."""
+        self._log_messages()
         return {
-            'is_valid': len(self.errors) == 0,
+            'is_valid': self.error_count == 0,
             'errors': self.errors,
             'warnings': self.warnings,
             'score': self._calculate_quality_score()
         }
-    
-    def _calculate_quality_score(self) -> float:
-        """Calculate webhook quality score (0-1)."""
-        score = 1.0
-        score -= len(self.errors) * 0.3  # Errors heavily penalized
-        score -= len(self.warnings) * 0.05  # Warnings lightly penalized
-        return max(0.0, score)
\ No newline at end of file
+
+
+
+# Per-thread validators for worker calls, so each keeps its own state and cache
+_worker_state = threading.local()
+
+
+def _validate_batch(validator_cls: Type[BaseValidator], items: List[Any]) -> List[Dict[str, Any]]:
+    """Worker entry point for BaseValidator.validate_many."""
+    validators = getattr(_worker_state, 'validators', None)
+    if validators is None:
+        validators = _worker_state.validators = {}
+    validator = validators.get(validator_cls)
+    if validator is None:
+        validator = validators[validator_cls] = validator_cls()
+    return [validator.validate(item) for item in items]